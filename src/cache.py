@@ -0,0 +1,294 @@
+"""
+Thread-safe, size-bounded TTL cache for fetched market data.
+"""
+
+import os
+import sys
+import time
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from config import (
+    CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_SWEEP_INTERVAL, CACHE_PERSIST_MIN_TTL
+)
+from market_clock import MarketClock
+from utils import log_info, log_warning, get_market_status, session_clock
+
+
+def estimate_size(value) -> int:
+    """Approximate the in-memory size of a cached value in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class DiskCache:
+    """SQLite-backed cache tier that survives restarts."""
+
+    def __init__(self, path: str, min_ttl: float = CACHE_PERSIST_MIN_TTL):
+        self.path = path
+        self.min_ttl = min_ttl
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB, timestamp REAL, ttl REAL, expires_at REAL)"
+        )
+        self._conn.commit()
+        self.sweep()
+
+    def get(self, key):
+        """Get (value, timestamp, ttl, stale_ttl) if still servable, else None."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, timestamp, ttl, expires_at FROM cache "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, time.time())
+                ).fetchone()
+            if row is None:
+                return None
+            value, timestamp, ttl, expires_at = row
+            return pickle.loads(value), timestamp, ttl, expires_at - timestamp - ttl
+        except Exception as e:
+            log_warning(f"Disk cache read failed for {key}: {str(e)}")
+            return None
+
+    def set(self, key, value, timestamp: float, ttl: float, stale_ttl: float = 0):
+        """Persist an entry until its stale window ends; short-lived entries are skipped."""
+        if ttl < self.min_ttl:
+            return
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, timestamp, ttl, timestamp + ttl + stale_ttl)
+                )
+                self._conn.commit()
+        except Exception as e:
+            log_warning(f"Disk cache write failed for {key}: {str(e)}")
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def sweep(self) -> int:
+        """Remove expired entries. Returns the number removed."""
+        try:
+            with self._lock:
+                removed = self._conn.execute(
+                    "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+                self._conn.commit()
+            return removed
+        except Exception as e:
+            log_warning(f"Disk cache sweep failed: {str(e)}")
+            return 0
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class Cache:
+    """LRU cache with per-entry TTLs, entry/byte limits and a background sweeper.
+
+    An optional DiskCache acts as a second tier: writes go through to it
+    and memory misses fall back to it, so valid entries survive restarts.
+    Entries set with a stale_ttl are kept that much longer past their TTL
+    so get_entry() can still serve them, flagged as stale.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, max_bytes: int = CACHE_MAX_BYTES,
+                 sweep_interval: float = CACHE_SWEEP_INTERVAL, disk: Optional[DiskCache] = None):
+        self.data = OrderedDict()  # key -> (value, timestamp, ttl, stale_ttl, size), oldest first
+        self.disk = disk
+        self.disk_hits = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.RLock()
+
+        self._stop = threading.Event()
+        self._sweeper = None
+        if sweep_interval:
+            self._sweeper = threading.Thread(target=self._sweep_loop, args=(sweep_interval,),
+                                             name="cache-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def get(self, key):
+        """Get cached value if not expired."""
+        entry = self.get_entry(key, allow_stale=False)
+        return entry[0] if entry is not None else None
+
+    def peek(self, key):
+        """In-memory value, even if expired, without touching LRU order or counters."""
+        with self._lock:
+            entry = self.data.get(key)
+            return entry[0] if entry is not None else None
+
+    def get_entry(self, key, allow_stale: bool = True) -> Optional[Tuple]:
+        """Get (value, is_stale), or None if the key is missing or past its stale window."""
+        now = time.time()
+        with self._lock:
+            entry = self.data.get(key)
+            if entry is not None:
+                value, timestamp, ttl, stale_ttl, _ = entry
+                age = now - timestamp
+                if age < ttl:  # Check TTL
+                    self.data.move_to_end(key)
+                    self.hits += 1
+                    return value, False
+                if age < ttl + stale_ttl:
+                    if allow_stale:
+                        self.data.move_to_end(key)
+                        self.stale_hits += 1
+                        return value, True
+                    self.misses += 1
+                    return None
+                self._remove(key)
+                self.expirations += 1
+
+        if self.disk is not None:
+            stored = self.disk.get(key)
+            if stored is not None:
+                value, timestamp, ttl, stale_ttl = stored
+                # Promote with the original timestamp so the TTL is not extended
+                self._store(key, value, timestamp, ttl, stale_ttl)
+                is_stale = now - timestamp >= ttl
+                if not is_stale or allow_stale:
+                    with self._lock:
+                        self.disk_hits += 1
+                        if is_stale:
+                            self.stale_hits += 1
+                        else:
+                            self.hits += 1
+                    return value, is_stale
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value, ttl, stale_ttl=0):
+        """Set cached value with TTL, evicting least recently used entries if over budget."""
+        timestamp = time.time()
+        self._store(key, value, timestamp, ttl, stale_ttl)
+        if self.disk is not None:
+            self.disk.set(key, value, timestamp, ttl, stale_ttl)
+
+    def _store(self, key, value, timestamp: float, ttl: float, stale_ttl: float):
+        """Insert into the memory tier and enforce the entry/byte budget."""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self.data:
+                self._remove(key)
+            self.data[key] = (value, timestamp, ttl, stale_ttl, size)
+            self.total_bytes += size
+
+            while self.data and (len(self.data) > self.max_entries or
+                                 self.total_bytes > self.max_bytes):
+                oldest = next(iter(self.data))
+                if oldest == key and len(self.data) == 1:
+                    break  # A single oversized entry is kept rather than thrashing
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Clear all cache."""
+        with self._lock:
+            self.data = OrderedDict()
+            self.total_bytes = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def sweep(self) -> int:
+        """Remove all entries past their TTL and stale window. Returns the number removed."""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, timestamp, ttl, stale_ttl, _) in self.data.items()
+                       if now - timestamp >= ttl + stale_ttl]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        if self.disk is not None:
+            self.disk.sweep()
+        return len(expired)
+
+    def stats(self) -> dict:
+        """Get hit/miss/eviction counters and current usage."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'entries': len(self.data),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def close(self):
+        """Stop the background sweeper and close the disk tier."""
+        self._stop.set()
+        if self.disk is not None:
+            self.disk.close()
+
+    def _remove(self, key):
+        """Drop an entry and its byte accounting (caller holds the lock)."""
+        size = self.data.pop(key)[-1]
+        self.total_bytes -= size
+
+    def _sweep_loop(self, interval: float):
+        """Periodically purge expired entries until closed."""
+        while not self._stop.wait(interval):
+            removed = self.sweep()
+            if removed:
+                stats = self.stats()
+                log_info(f"Cache sweep removed {removed} expired entries "
+                         f"({stats['entries']} entries, {stats['bytes'] // 1024} KB, "
+                         f"hit rate {stats['hit_rate']:.0%}, {stats['evictions']} evictions)")
+
+
+class SessionTTLPolicy:
+    """Cache TTLs that follow the market session.
+
+    ttls maps a data kind to {market status: seconds}, keyed by the
+    statuses of utils.get_market_status(). While the market is CLOSED an
+    entry is valid until the next session starts, since nothing it holds
+    can change before then. In every session the TTL is capped at the next
+    session boundary, so an entry never outlives the session it was
+    fetched in. Kinds not in ttls keep the caller's default.
+    """
+
+    def __init__(self, ttls: Dict[str, Dict[str, float]], clock: MarketClock = session_clock):
+        self.ttls = ttls
+        self.clock = clock
+
+    def ttl(self, kind: str, default: float) -> float:
+        by_status = self.ttls.get(kind)
+        if by_status is None:
+            return default
+        until_boundary = self.clock.seconds_until_transition()
+        status = get_market_status()
+        if status == "CLOSED":
+            return until_boundary
+        return min(by_status.get(status, default), until_boundary)
@@ -0,0 +1,120 @@
+"""
+Circuit breakers and jittered retries for upstream calls.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop calling an upstream after repeated failures, then probe it.
+
+    closed: calls go through; failure_threshold consecutive failures open it.
+    open: calls fail fast until cooldown has passed.
+    half_open: one probe call goes through; success closes the circuit,
+    failure opens it for another cooldown.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self.short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the probe when half-open)."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self._state = self.HALF_OPEN
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, fn: Callable, *args):
+        """Run fn(*args) through the breaker, failing fast while it is open."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit open")
+        try:
+            result = fn(*args)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+class BreakerRegistry:
+    """Circuit breakers created on first use, one per provider or host."""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, self.failure_threshold, self.cooldown)
+                self._breakers[name] = breaker
+            return breaker
+
+    def stats(self) -> Dict[str, Dict]:
+        """State and short-circuited call count per breaker."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {
+            breaker.name: {'state': breaker.state, 'short_circuited': breaker.short_circuited}
+            for breaker in breakers
+        }
+
+
+def retry(fn: Callable, attempts: int = 2, base_delay: float = 0.25, max_delay: float = 2.0,
+          retryable: Optional[Callable[[Exception], bool]] = None):
+    """Call fn(), retrying failures with capped, fully jittered exponential backoff.
+
+    retryable(exception) can veto a retry (e.g. for 4xx responses).
+    """
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts - 1 or (retryable and not retryable(e)):
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** attempt)))
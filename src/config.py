@@ -2,6 +2,8 @@
 Configuration and constants for the Markets Dashboard.
 """
 
+import os
+
 # Window Settings
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 950
@@ -18,23 +20,171 @@ PREMARKET_START_MINUTE = 0
 AFTERHOURS_END_HOUR = 20
 AFTERHOURS_END_MINUTE = 0
 
+# Exchange holidays (closed all day) and early closes (regular session ends
+# at the given ET time), from the NYSE calendar; extend each year
+MARKET_HOLIDAYS = [
+    '2025-01-01', '2025-01-09', '2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26',
+    '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25',
+    '2026-01-01', '2026-01-19', '2026-02-16', '2026-04-03', '2026-05-25', '2026-06-19',
+    '2026-07-03', '2026-09-07', '2026-11-26', '2026-12-25',
+    '2027-01-01', '2027-01-18', '2027-02-15', '2027-03-26', '2027-05-31', '2027-06-18',
+    '2027-07-05', '2027-09-06', '2027-11-25', '2027-12-24',
+]
+MARKET_EARLY_CLOSES = {
+    '2025-07-03': '13:00',
+    '2025-11-28': '13:00',
+    '2025-12-24': '13:00',
+    '2026-11-27': '13:00',
+    '2026-12-24': '13:00',
+    '2027-11-26': '13:00',
+}
+SESSION_TIMER_SLACK = 2  # Seconds past an open/close that aligned refreshes fire (> coalesce window)
+
 # Refresh Intervals (seconds)
 MARKET_HOURS_INTERVAL = 60  # 1 minute during market hours
 PREMARKET_INTERVAL = 300  # 5 minutes before market open
 AFTERHOURS_INTERVAL = 1800  # 30 minutes after market close
 OVERNIGHT_INTERVAL = 3600  # 1 hour overnight
 
+# Per-panel refresh cadence: every max(session interval above, TTL of the
+# panel's data kind), each panel on its own timer
+PANEL_DATA_KINDS = {
+    'overview': 'quotes',
+    'charts': 'quotes',
+    'movers': 'quotes',
+    'volatility': 'iv',
+    'news': 'news',
+    'econ_calendar': 'calendar',
+    'earnings': 'calendar',
+}
+SCHEDULER_MAX_WORKERS = 8  # Persistent refresh workers (one per panel plus the prefetch)
+SCHEDULER_COALESCE_SECONDS = 1  # Panels due this close together refresh as one batch
+
+# Fetch priority classes (lower first): within a refresh batch each class
+# starts once the classes above it are done, or after PRIORITY_HOLD_SHARE
+# of TARGET_LOAD_TIME_SECONDS, and its fetches queue behind theirs
+PANEL_PRIORITY = {
+    'overview': 0,
+    'movers': 1,
+    'charts': 1,
+    'volatility': 2,
+    'news': 2,
+    'econ_calendar': 2,
+    'earnings': 2,
+}
+PRIORITY_HOLD_SHARE = 0.4
+DEFERRABLE_PRIORITY = 2  # Classes from here on skip a cycle while their provider is congested
+PRIORITY_DEFER_SECONDS = 10  # How long a skipped panel waits before trying again
+
+# Adaptive refresh: quote and IV panels scale their session interval by a factor
+# that shrinks while their data moves and grows while it does not. Never faster
+# than the data's cache TTL, and never faster than base while the provider queues.
+ADAPTIVE_REFRESH_ENABLED = True
+ADAPTIVE_MIN_FACTOR = 0.5  # 2x: the quote TTL floor (30s against a 60s base) allows no more
+ADAPTIVE_MAX_FACTOR = 4.0
+ADAPTIVE_CALM_MOVE_PCT = 0.02  # Median % move per minute at or below which a panel slows down
+ADAPTIVE_BUSY_MOVE_PCT = 0.10  # ...and at or above which it speeds up
+ADAPTIVE_STEP = 1.5  # Factor change per calm or busy refresh
+ADAPTIVE_ALERT_SYMBOL = '^VIX'  # A VIX_ALERT_THRESHOLD move refreshes every adaptive panel at once
+
 # Cache Settings (seconds)
 QUOTE_CACHE_TTL = 30
 NEWS_CACHE_TTL = 300
 ECONOMIC_CALENDAR_CACHE_TTL = 3600
+EARNINGS_CALENDAR_CACHE_TTL = 3600
 IV_CACHE_TTL = 60
+SYMBOL_INFO_CACHE_TTL = 86400  # Ticker .info payload (market cap, estimates); quotes want it fresher
+DATA_KIND_TTL = {
+    'quotes': QUOTE_CACHE_TTL,
+    'iv': IV_CACHE_TTL,
+    'news': NEWS_CACHE_TTL,
+    'calendar': min(ECONOMIC_CALENDAR_CACHE_TTL, EARNINGS_CALENDAR_CACHE_TTL),
+}
+# Session-aware TTLs per market status (the TTLs above apply while the market is
+# open). While CLOSED, prices cannot move, so entries stay valid until the next
+# session starts; no entry of these kinds outlives a session boundary.
+SESSION_CACHE_TTL = {
+    'quotes': {'MARKET OPEN': QUOTE_CACHE_TTL, 'PREMARKET': 120, 'AFTER HOURS': 300},
+    'iv': {'MARKET OPEN': IV_CACHE_TTL, 'PREMARKET': 900, 'AFTER HOURS': 1800},
+}
+CACHE_MAX_ENTRIES = 2000
+CACHE_MAX_BYTES = 64 * 1024 * 1024  # Approximate in-memory budget
+CACHE_SWEEP_INTERVAL = 60  # Seconds between expired-entry sweeps
+CACHE_PERSIST_ENABLED = True  # Keep a SQLite copy of cache entries for warm restarts
+CACHE_PERSIST_MIN_TTL = 60  # Entries with shorter TTLs are not worth persisting
+# Stale-while-revalidate: expired entries of these data kinds are served for up to
+# N more seconds while a background refresh runs. Kinds not listed block on a fetch.
+STALE_WHILE_REVALIDATE = {
+    'quotes': 300,
+    'iv': 3600,
+    'news': 3600,
+    'calendar': 86400,
+}
+CACHE_DIR = os.path.join(
+    os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+    'markets-dashboard'
+)
+
+# Batch Fetching
+QUOTE_BATCH_CHUNK_SIZE = 50  # Symbols per batched quote request / history download
+YAHOO_QUOTE_URL = 'https://query1.finance.yahoo.com/v7/finance/quote'  # Many symbols per request
+YAHOO_DOWNLOAD_THREADS = 4  # yf.download makes one history request per symbol; this many at once
+FETCH_MAX_WORKERS = 16  # Shared fetcher thread pool size
+PROVIDER_MAX_CONCURRENCY = {  # Max in-flight requests per provider
+    'yahoo': 8,
+    'rss': 4,
+}
 
 # API Rate Limits (calls per minute)
+YAHOO_RATE_LIMIT = 360  # Unofficial; keeps bursts of .info lookups polite
 ALPHA_VANTAGE_RATE_LIMIT = 5
 FRED_RATE_LIMIT = 120
 POLYGON_RATE_LIMIT = 5
 FINNHUB_RATE_LIMIT = 60
+RATE_LIMITS = {
+    'yahoo': YAHOO_RATE_LIMIT,
+    'alpha_vantage': ALPHA_VANTAGE_RATE_LIMIT,
+    'fred': FRED_RATE_LIMIT,
+    'polygon': POLYGON_RATE_LIMIT,
+    'finnhub': FINNHUB_RATE_LIMIT,
+}
+# Data providers in priority order per capability; keyed providers are
+# only used when their API key is set in .env
+PROVIDER_PRIORITY = {
+    'quote': ['yahoo', 'finnhub', 'alpha_vantage'],
+    'daily_closes': ['yahoo', 'alpha_vantage'],
+    'earnings_calendar': ['yahoo', 'finnhub'],
+}
+PROVIDER_TIMEOUT = (3, 10)  # (connect, read) seconds per keyed-provider request
+PROVIDER_CALL_TIMEOUT = 15  # Give up on a capability after this many seconds
+HEDGE_LATENCY_QUANTILE = 0.95  # Fire the backup once the primary is slower than this
+HEDGE_DEFAULT_DELAY = 1.5  # Seconds, until a provider has latency samples
+HEDGE_MIN_DELAY = 0.2
+HEDGE_MAX_DELAY = 5.0
+
+RATE_LIMIT_BURST = {  # Calls allowed back to back; defaults to one minute's quota
+    'yahoo': 60,
+}
+
+# Circuit breakers (per provider / feed host) and retries for upstream calls
+BREAKER_FAILURE_THRESHOLD = 5  # Consecutive failed calls before the circuit opens
+BREAKER_COOLDOWN = 30  # Seconds an open circuit fails fast before one probe call
+RETRY_ATTEMPTS = 2  # Tries per call on connection errors, timeouts and 5xx
+RETRY_BASE_DELAY = 0.25  # Seconds; backoff doubles per attempt, fully jittered
+RETRY_MAX_DELAY = 2.0
+YAHOO_TIMEOUT = 10  # Seconds per yfinance download/history request
+YAHOO_BLOCKING_WORKERS = 4  # Threads for yfinance lookups with no timeout of their own (.info, .calendar)
+INFLIGHT_WAIT_TIMEOUT = 30  # Seconds a coalesced fetch waits on the thread already fetching it
+
+# Request planning: max symbols per upstream call, by provider and data kind.
+# Kinds run in this order each refresh (IV reads the quotes' live prices).
+PROVIDER_BATCH_LIMITS = {
+    'yahoo': {'quotes': QUOTE_BATCH_CHUNK_SIZE, 'info': 1, 'iv': QUOTE_BATCH_CHUNK_SIZE},
+}
+# Batched kinds that still cost one request (and rate-limit token) per symbol
+PROVIDER_PER_SYMBOL_COST = {
+    'yahoo': ['iv'],  # yf.download fans out to one history request per symbol
+}
 
 # Symbols to Track
 
@@ -64,8 +214,20 @@ RATES_MACRO = {
 
 # Stocks for IV Heat Map
 IV_STOCKS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'JPM', 'XOM', 'SPY']
+IV_SHORT_WINDOW = 10  # Daily returns in the "current" volatility window
+IV_LONG_WINDOW = 30  # Daily returns in the average volatility window
+TRADING_DAYS_PER_YEAR = 252
+
+# Stocks checked for earnings reports
+EARNINGS_STOCKS = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META']
 
 # Top Movers Criteria
+# Common large-cap stocks to scan (yfinance has no direct screener API)
+MOVERS_UNIVERSE = [
+    'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'NVDA', 'TSLA', 'META', 'JPM',
+    'V', 'JNJ', 'WMT', 'PG', 'UNH', 'MA', 'DIS', 'BA', 'CSCO',
+    'INTC', 'AMD', 'NFLX', 'GOOG', 'UBER', 'IBM', 'PAYX', 'GE'
+]
 MIN_MARKET_CAP_BILLIONS = 5  # Only track stocks > $5B market cap
 TOP_MOVERS_COUNT = 5  # Show top 5 gainers and losers
 MIN_VOLUME_RATIO = 1.0  # Minimum volume compared to average
@@ -78,6 +240,16 @@ NEWS_SOURCES = {
     'WSJ': 'https://feeds.wsj.com/xml/rss/3_7085.xml',
 }
 NEWS_LIMIT = 10
+NEWS_ENTRIES_PER_SOURCE = 3
+NEWS_FETCH_TIMEOUT = (3, 5)  # (connect, read) seconds per feed request
+NEWS_FETCH_DEADLINE = 4  # Seconds to wait for all feeds (within TARGET_LOAD_TIME_SECONDS)
+NEWS_STREAMING_PARSER = True  # Stop reading a feed after NEWS_ENTRIES_PER_SOURCE items
+NEWS_STREAM_CHUNK_SIZE = 16384  # Bytes read per chunk when streaming a feed
+NEWS_SUMMARY_CHARS = 200
+NEWS_STORE_MAX_ITEMS = 500  # Headlines kept in the deduplicated news store
+NEWS_STORE_MAX_AGE_HOURS = 48
+NEWS_DEDUP_WINDOW_HOURS = 6  # Same title from another source within this window is one story
+NEWS_SNAPSHOT_SIZE = 50  # Newest headlines cached (and persisted) per refresh
 
 # Volatility Heat Map Color Coding
 IV_COLOR_THRESHOLDS = {
@@ -149,4 +321,5 @@ LOG_LEVEL = 'INFO'
 SHOW_SPLASH_SCREEN = True
 AUTO_REFRESH_ENABLED = True
 LOAD_DATA_IN_PARALLEL = True
-TARGET_LOAD_TIME_SECONDS = 5
+TARGET_LOAD_TIME_SECONDS = 5  # Refresh deadline; panels not done by then render late
+PREFETCH_BUDGET_SHARE = 0.6  # Share of the deadline for the planned quote/IV batch
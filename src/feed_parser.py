@@ -0,0 +1,109 @@
+"""
+Streaming RSS/Atom parser that stops after the first few items.
+"""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional
+
+import feedparser
+
+
+def _local(tag: str) -> str:
+    """Tag name without its XML namespace."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_date(text: Optional[str]) -> Optional[datetime]:
+    """RFC 822 (RSS) or ISO 8601 (Atom) date as naive UTC, like feedparser."""
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _entry(item: ET.Element, summary_chars: int) -> Dict:
+    """Pull title, link, id, date and a truncated summary out of an item/entry."""
+    fields = {}
+    link = None
+    for child in item:
+        tag = _local(child.tag)
+        if tag == 'link':
+            # Atom links carry the URL in href; prefer rel="alternate"
+            href = child.get('href')
+            if href is None:
+                link = link or (child.text or '').strip()
+            elif child.get('rel', 'alternate') == 'alternate' or link is None:
+                link = href
+        elif tag not in fields:
+            fields[tag] = ''.join(child.itertext()).strip()
+
+    date = fields.get('pubDate') or fields.get('published') or fields.get('updated') or fields.get('date')
+    summary = fields.get('description') or fields.get('summary') or ''
+    return {
+        'id': fields.get('guid') or fields.get('id'),
+        'title': fields.get('title', 'No title'),
+        'link': link or '',
+        'summary': summary[:summary_chars],
+        'published': _parse_date(date),
+    }
+
+
+def stream_entries(chunks: Iterable[bytes], limit: int, summary_chars: int = 200) -> List[Dict]:
+    """Parse the first `limit` items of a feed from a stream of byte chunks.
+
+    Stops reading as soon as enough items are seen, so the rest of the
+    document is never downloaded or parsed. Raises ET.ParseError on
+    malformed XML.
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    entries = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if _local(elem.tag) in ('item', 'entry'):
+                entries.append(_entry(elem, summary_chars))
+                elem.clear()
+                if len(entries) >= limit:
+                    return entries
+    parser.close()
+    return entries
+
+
+def parse_entries(chunks: Iterable[bytes], limit: int, summary_chars: int = 200) -> List[Dict]:
+    """First `limit` feed entries, falling back to feedparser for malformed XML."""
+    chunks = iter(chunks)
+    seen = []
+
+    def recorded():
+        for chunk in chunks:
+            seen.append(chunk)
+            yield chunk
+
+    try:
+        return stream_entries(recorded(), limit, summary_chars)
+    except ET.ParseError:
+        # feedparser tolerates broken markup and undeclared HTML entities
+        return feedparser_entries(b''.join(seen) + b''.join(chunks), limit, summary_chars)
+
+
+def feedparser_entries(content: bytes, limit: int, summary_chars: int = 200) -> List[Dict]:
+    """First `limit` entries of a whole document parsed with feedparser."""
+    feed = feedparser.parse(content)
+    return [{
+        'id': entry.get('id'),
+        'title': entry.get('title', 'No title'),
+        'link': entry.get('link', ''),
+        'summary': entry.get('summary', '')[:summary_chars],
+        'published': datetime(*entry.published_parsed[:6]) if entry.get('published_parsed') else None,
+    } for entry in feed.entries[:limit]]
@@ -0,0 +1,68 @@
+"""
+Incremental per-symbol price history store.
+"""
+
+import threading
+from typing import Optional
+import pandas as pd
+
+
+def period_days(period: str) -> Optional[int]:
+    """Number of trading days in a yfinance 'Nd' period, or None for other periods."""
+    if period.endswith('d') and period[:-1].isdigit():
+        return int(period[:-1])
+    return None
+
+
+class PriceHistoryStore:
+    """Keep downloaded bars per (symbol, period, interval) and merge in new ones.
+
+    Only 'Nd' periods are stored incrementally; the window is trimmed to
+    the last N trading dates after each merge.
+    """
+
+    def __init__(self):
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def supports(self, period: str) -> bool:
+        """Whether a period can be refreshed incrementally."""
+        return period_days(period) is not None
+
+    def last_timestamp(self, key) -> Optional[pd.Timestamp]:
+        """Timestamp of the newest stored bar, or None if nothing is stored."""
+        with self._lock:
+            frame = self._frames.get(key)
+        if frame is None or frame.empty:
+            return None
+        return frame.index[-1]
+
+    def merge(self, key, new_bars: pd.DataFrame, period: str) -> pd.DataFrame:
+        """Merge new bars into the stored window and return the result.
+
+        Bars at an existing timestamp replace the stored ones, so the
+        partial last bar is overwritten by its updated version.
+        """
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is None or frame.empty:
+                merged = new_bars
+            elif new_bars.empty:
+                merged = frame
+            else:
+                merged = pd.concat([frame, new_bars])
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+            days = period_days(period)
+            if days is not None and not merged.empty:
+                dates = merged.index.normalize().unique()
+                if len(dates) > days:
+                    merged = merged[merged.index >= dates[-days]]
+
+            self._frames[key] = merged
+            return merged
+
+    def clear(self):
+        """Drop all stored bars."""
+        with self._lock:
+            self._frames = {}
@@ -12,13 +12,20 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import tkinter as tk
-import threading
 from datetime import datetime
+from typing import List, Optional
 from config import (
     WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, THEME, COLORS, FONTS,
-    MARKET_HOURS_INTERVAL, PREMARKET_INTERVAL, AFTERHOURS_INTERVAL, OVERNIGHT_INTERVAL
+    MARKET_HOURS_INTERVAL, PREMARKET_INTERVAL, AFTERHOURS_INTERVAL, OVERNIGHT_INTERVAL,
+    TARGET_LOAD_TIME_SECONDS, PREFETCH_BUDGET_SHARE, PANEL_DATA_KINDS,
+    SCHEDULER_MAX_WORKERS, SCHEDULER_COALESCE_SECONDS, PANEL_PRIORITY, PRIORITY_HOLD_SHARE,
+    DEFERRABLE_PRIORITY, PRIORITY_DEFER_SECONDS, SESSION_TIMER_SLACK,
+    ADAPTIVE_REFRESH_ENABLED, ADAPTIVE_MIN_FACTOR, ADAPTIVE_MAX_FACTOR, ADAPTIVE_CALM_MOVE_PCT,
+    ADAPTIVE_BUSY_MOVE_PCT, ADAPTIVE_STEP, ADAPTIVE_ALERT_SYMBOL, VIX_ALERT_THRESHOLD
 )
 from data_fetcher import MarketDataFetcher
+from scheduler import RefreshScheduler
+from refresh_controller import AdaptiveRefreshController
 from ui_components import RefreshButton, StatusBar, LoadingSpinner
 from panels.market_overview import MarketOverviewPanel
 from panels.movers import MoversPanel
@@ -28,9 +35,10 @@ from panels.economic_calendar import EconomicCalendarPanel
 from panels.earnings_calendar import EarningsCalendarPanel
 from panels.charts import ChartsPanel
 from utils import (
-    log_info, log_error, is_market_hours, is_premarket, is_after_hours,
-    get_market_status, get_current_et_time, format_time_et
+    log_info, log_error, log_warning, session_clock, get_market_status,
+    get_current_et_time, format_time_et
 )
+from market_clock import MarketClock
 
 
 class MarketsDashboard(tk.Tk):
@@ -49,12 +57,43 @@ class MarketsDashboard(tk.Tk):
 
         # State
         self.is_loading = False
-        self.refresh_timer = None
+        self.loading_batches = 0  # refresh batches not yet finished or past deadline
         self.panels = {}
 
         # Create UI
         self.create_layout()
 
+        # Quote and IV panels speed up while their data moves, slow down while it doesn't
+        self.refresh_controller = None
+        if ADAPTIVE_REFRESH_ENABLED:
+            self.refresh_controller = AdaptiveRefreshController(
+                min_factor=ADAPTIVE_MIN_FACTOR, max_factor=ADAPTIVE_MAX_FACTOR,
+                calm_move_pct=ADAPTIVE_CALM_MOVE_PCT, busy_move_pct=ADAPTIVE_BUSY_MOVE_PCT,
+                step=ADAPTIVE_STEP, alert_threshold=VIX_ALERT_THRESHOLD,
+            )
+
+        # Each panel refreshes on its own cadence from a persistent worker pool
+        self.scheduler = RefreshScheduler(
+            max_workers=SCHEDULER_MAX_WORKERS,
+            budget=TARGET_LOAD_TIME_SECONDS,
+            coalesce=SCHEDULER_COALESCE_SECONDS,
+            prepare=self._prefetch,
+            prepare_share=PREFETCH_BUDGET_SHARE,
+            on_batch_start=lambda names: self.after(0, self._start_loading, names),
+            on_batch_end=lambda names, late: self.after(0, self._finish_loading, late),
+            on_late_done=lambda late: self.after(0, self._update_status, late),
+            hold_share=PRIORITY_HOLD_SHARE,
+            should_defer=self._should_defer,
+            defer_delay=PRIORITY_DEFER_SECONDS,
+            on_batch_timing=self._log_timing,
+        )
+        for name, panel in self.panels.items():
+            kind = PANEL_DATA_KINDS.get(name, 'quotes')
+            self.scheduler.add(name, lambda name=name: self._refresh_panel(name),
+                               lambda kind=kind, name=name: self.refresh_interval(kind, name),
+                               prepared=hasattr(panel, 'data_requests'),
+                               priority=self._priority(name))
+
         # Load initial data
         self.load_initial_data()
 
@@ -138,130 +177,134 @@ class MarketsDashboard(tk.Tk):
         self.panels['earnings'] = earnings
 
     def load_initial_data(self):
-        """Load initial data in a separate thread."""
-        if self.is_loading:
+        """Start refreshing every panel on its own schedule."""
+        self.status_bar.update_status("Loading market data...")
+        self.scheduler.start()
+
+    def _prefetch(self, names: List[str], deadline: float):
+        """Plan and run the shared upstream calls of the panels in a batch.
+
+        Runs on a scheduler worker; the quote-backed panels in the batch wait
+        for it (up to the refresh deadline), then render from the cache.
+        """
+        # names arrive highest priority first, so their symbols fill the first batches;
+        # each data kind is fetched in the class of the most urgent panel asking for it
+        requests = [self.panels[name].data_requests() for name in names]
+        self.data_fetcher.prefetch(requests, deadline=deadline,
+                                   priorities=[self._priority(name) for name in names])
+
+    def _priority(self, name: str) -> int:
+        """Fetch priority class of a panel (lower fetches first)."""
+        return PANEL_PRIORITY.get(name, max(PANEL_PRIORITY.values()))
+
+    def _refresh_panel(self, name: str):
+        """Refresh one panel with its fetches in the panel's priority class."""
+        with self.data_fetcher.priority(self._priority(name)):
+            self.panels[name].update_data()
+        self._observe(name)
+
+    def _observe(self, name: str):
+        """Feed a refreshed panel's values to the adaptive refresh controller."""
+        panel = self.panels[name]
+        if self.refresh_controller is None or not hasattr(panel, 'data_requests'):
             return
-
+        kind = PANEL_DATA_KINDS.get(name, 'quotes')
+        values = self.data_fetcher.observed_values(kind, panel.data_requests().get(kind, []))
+        alert = self.data_fetcher.observed_values('quotes', [ADAPTIVE_ALERT_SYMBOL])
+        if self.refresh_controller.observe(name, values, alert.get(ADAPTIVE_ALERT_SYMBOL)):
+            self.scheduler.trigger([panel_name for panel_name in self.panels
+                                    if hasattr(self.panels[panel_name], 'data_requests')])
+
+    def _should_defer(self, name: str) -> bool:
+        """Skip a low-priority panel this cycle while its provider is congested."""
+        if self._priority(name) < DEFERRABLE_PRIORITY:
+            return False
+        if not self.data_fetcher.is_congested(PANEL_DATA_KINDS.get(name, 'quotes')):
+            return False
+        log_info(f"Deferring {name} refresh by {PRIORITY_DEFER_SECONDS}s (upstream congested)")
+        return True
+
+    def _log_timing(self, names: List[str], first_paint: float, complete: float):
+        """Report time to first useful paint separately from time to complete."""
+        log_info(f"Refresh timing for {', '.join(names)}: first useful paint "
+                 f"{first_paint:.2f}s, complete {complete:.2f}s")
+
+    def _start_loading(self, names: List[str]):
+        """Show the loading state while a refresh batch is in flight."""
+        self.loading_batches += 1
         self.is_loading = True
         self.loading_spinner.start()
         self.refresh_btn.config(state='disabled')
-        self.status_bar.update_status("Loading market data...")
+        log_info(f"Refreshing: {', '.join(names)}")
 
-        # Fetch data in background thread
-        thread = threading.Thread(target=self._load_data_thread, daemon=True)
-        thread.start()
-
-    def _load_data_thread(self):
-        """Load data in background thread."""
-        try:
-            # Fetch data for all panels in parallel
-            threads = []
-
-            def fetch_overview():
-                if 'overview' in self.panels:
-                    self.panels['overview'].update_data()
-
-            def fetch_movers():
-                if 'movers' in self.panels:
-                    self.panels['movers'].update_data()
-
-            def fetch_volatility():
-                if 'volatility' in self.panels:
-                    self.panels['volatility'].update_data()
-
-            def fetch_news():
-                if 'news' in self.panels:
-                    self.panels['news'].update_data()
-
-            def fetch_econ():
-                if 'econ_calendar' in self.panels:
-                    self.panels['econ_calendar'].update_data()
-
-            def fetch_earnings():
-                if 'earnings' in self.panels:
-                    self.panels['earnings'].update_data()
-
-            def fetch_charts():
-                if 'charts' in self.panels:
-                    self.panels['charts'].update_data()
-
-            threads.append(threading.Thread(target=fetch_overview, daemon=True))
-            threads.append(threading.Thread(target=fetch_movers, daemon=True))
-            threads.append(threading.Thread(target=fetch_volatility, daemon=True))
-            threads.append(threading.Thread(target=fetch_news, daemon=True))
-            threads.append(threading.Thread(target=fetch_econ, daemon=True))
-            threads.append(threading.Thread(target=fetch_earnings, daemon=True))
-            threads.append(threading.Thread(target=fetch_charts, daemon=True))
-
-            # Start all threads
-            for t in threads:
-                t.start()
-
-            # Wait for all to complete
-            for t in threads:
-                t.join(timeout=30)
-
-            # Update UI on main thread
-            self.after(0, self._finish_loading)
-
-        except Exception as e:
-            log_error("Error loading data", e)
-            self.after(0, self._finish_loading)
-
-    def _finish_loading(self):
-        """Finish loading and update UI."""
-        self.is_loading = False
-        self.loading_spinner.stop()
-        self.refresh_btn.config(state='normal')
+    def _finish_loading(self, late: Optional[List[str]] = None):
+        """Finish a refresh batch and update UI.
 
-        # Update status
-        market_status = get_market_status()
-        current_time = format_time_et(get_current_et_time())
-        self.status_bar.update_status(f"Status: {market_status}")
-        self.status_bar.update_time(current_time)
+        A batch finishes when its panels are done or at the refresh
+        deadline; panels still fetching then render when their data arrives.
+        """
+        self.loading_batches = max(0, self.loading_batches - 1)
+        if self.loading_batches == 0:
+            self.is_loading = False
+            self.loading_spinner.stop()
+            self.refresh_btn.config(state='normal')
 
-        log_info("Data loading completed")
+        self._update_status(late)
 
-        # Schedule next refresh
-        self.schedule_refresh()
+        if late:
+            log_warning(f"Refresh deadline reached; still loading: {', '.join(late)}")
+        log_info("Data loading completed")
 
-    def schedule_refresh(self):
-        """Schedule the next auto-refresh based on market hours."""
-        # Cancel existing timer
-        if self.refresh_timer:
-            self.after_cancel(self.refresh_timer)
+    def _update_status(self, late: Optional[List[str]] = None):
+        """Show market status and time, noting panels still loading."""
+        market_status = get_market_status()
+        current_time = format_time_et(get_current_et_time())
+        status = f"Status: {market_status}"
+        if late:
+            status += f" (still loading: {', '.join(late)})"
+        self.status_bar.update_status(status)
+        self.status_bar.update_time(current_time)
 
-        # Determine refresh interval
-        if is_market_hours():
+    def refresh_interval(self, kind: str, name: Optional[str] = None) -> float:
+        """Seconds between refreshes of a panel showing a data kind.
+
+        The market session sets the pace, scaled by the panel's adaptive
+        factor (only sped up while its provider has quota to spare), but a
+        panel never refreshes more often than its data's current cache TTL,
+        so each tick only redoes what expired; while the market is closed
+        that idles quote and IV panels until the next session. A refresh due
+        after the next open or close is pulled in to land just past it instead.
+        """
+        session = session_clock.session()
+        if session == MarketClock.REGULAR:
             interval = MARKET_HOURS_INTERVAL
-        elif is_premarket():
+        elif session == MarketClock.PREMARKET:
             interval = PREMARKET_INTERVAL
-        elif is_after_hours():
+        elif session == MarketClock.AFTER_HOURS:
             interval = AFTERHOURS_INTERVAL
         else:
             interval = OVERNIGHT_INTERVAL
 
-        # Schedule next refresh
-        interval_ms = interval * 1000
-        self.refresh_timer = self.after(interval_ms, self.auto_refresh)
-        log_info(f"Next refresh scheduled in {interval} seconds")
+        if self.refresh_controller is not None and name is not None:
+            factor = self.refresh_controller.factor(name)
+            if factor < 1 and self.data_fetcher.is_congested(kind):
+                factor = 1.0
+            interval *= factor
 
-    def auto_refresh(self):
-        """Auto-refresh data."""
-        if not self.is_loading:
-            self.load_initial_data()
+        interval = max(interval, self.data_fetcher.ttl(kind))
+        return min(interval, session_clock.seconds_until_transition() + SESSION_TIMER_SLACK)
 
     def manual_refresh(self):
         """Manual refresh triggered by user."""
         log_info("Manual refresh triggered")
         self.data_fetcher.clear_cache()
-        self.load_initial_data()
+        self.scheduler.trigger()
 
     def on_closing(self):
         """Handle window closing."""
         log_info("Application closing")
-        if self.refresh_timer:
-            self.after_cancel(self.refresh_timer)
+        self.scheduler.stop()
+        self.data_fetcher.close()
         self.destroy()
 
 
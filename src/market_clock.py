@@ -0,0 +1,139 @@
+"""
+Exchange session clock with holidays and early closes.
+"""
+
+import bisect
+import threading
+import time
+from datetime import date as Date, datetime, time as Time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pytz
+
+
+class MarketClock:
+    """US equity sessions as a precomputed, sorted table of transitions.
+
+    Each trading day has four transitions: premarket starts, the regular
+    session opens, it closes, and after hours ends. Holidays and weekends
+    stay closed; early-close days shut the regular session at their own
+    time and keep the usual after-hours length. The table covers the
+    previous, current and next year and grows on demand.
+
+    Lookups remember the last position, so the usual "what session is it
+    now" query is O(1) as time moves forward.
+    """
+
+    PREMARKET = 'premarket'
+    REGULAR = 'regular'
+    AFTER_HOURS = 'after_hours'
+    CLOSED = 'closed'
+
+    def __init__(self, holidays: Iterable[str] = (), early_closes: Optional[Dict[str, str]] = None,
+                 tz: str = 'US/Eastern', premarket_start: Time = Time(7, 0),
+                 market_open: Time = Time(9, 30), market_close: Time = Time(16, 0),
+                 after_hours_end: Time = Time(20, 0)):
+        self.tz = pytz.timezone(tz)
+        self.holidays = {Date.fromisoformat(day) for day in holidays}
+        self.early_closes = {Date.fromisoformat(day): Time.fromisoformat(close)
+                             for day, close in (early_closes or {}).items()}
+        self.premarket_start = premarket_start
+        self.market_open = market_open
+        self.market_close = market_close
+        self.after_hours = (datetime.combine(Date.min, after_hours_end)
+                            - datetime.combine(Date.min, market_close))
+        self._lock = threading.Lock()
+        self._table = ([], [])  # (epoch seconds, session starting then)
+        self._years = None
+        self._hint = 0
+        year = datetime.now(self.tz).year
+        self._build(year - 1, year + 1)
+
+    def is_trading_day(self, day: Date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def _day_transitions(self, day: Date) -> List[Tuple[float, str]]:
+        if not self.is_trading_day(day):
+            return []
+        close = self.early_closes.get(day, self.market_close)
+        close_at = datetime.combine(day, close)
+        points = [
+            (datetime.combine(day, self.premarket_start), self.PREMARKET),
+            (datetime.combine(day, self.market_open), self.REGULAR),
+            (close_at, self.AFTER_HOURS),
+            (close_at + self.after_hours, self.CLOSED),
+        ]
+        return [(self.tz.localize(moment).timestamp(), session) for moment, session in points]
+
+    def _build(self, first_year: int, last_year: int):
+        """Replace the table with every transition from first_year through last_year."""
+        times, sessions = [], []
+        day = Date(first_year, 1, 1)
+        while day.year <= last_year:
+            for moment, session in self._day_transitions(day):
+                times.append(moment)
+                sessions.append(session)
+            day += timedelta(days=1)
+        self._table = (times, sessions)
+        self._years = (first_year, last_year)
+        self._hint = 0
+
+    def _locate(self, ts: float) -> Tuple[List[float], List[str], int]:
+        """Table and index of the last transition at or before ts."""
+        times, sessions = self._table
+        if not times or ts < times[0] or ts >= times[-1]:
+            with self._lock:
+                year = datetime.fromtimestamp(ts, self.tz).year
+                first, last = self._years
+                if year - 1 < first or year + 1 > last:
+                    self._build(min(first, year - 1), max(last, year + 1))
+                times, sessions = self._table
+
+        i = self._hint
+        if not (i < len(times) and times[i] <= ts
+                and (i + 1 == len(times) or ts < times[i + 1])):
+            if i + 2 < len(times) and times[i + 1] <= ts < times[i + 2]:
+                i += 1
+            else:
+                i = bisect.bisect_right(times, ts) - 1
+            self._hint = max(i, 0)
+        return times, sessions, i
+
+    @staticmethod
+    def _timestamp(at: Optional[datetime]) -> float:
+        return time.time() if at is None else at.timestamp()
+
+    def session(self, at: Optional[datetime] = None) -> str:
+        """Session in progress at `at` (an aware datetime; now by default)."""
+        times, sessions, i = self._locate(self._timestamp(at))
+        return sessions[i] if i >= 0 else self.CLOSED
+
+    def next_transition(self, at: Optional[datetime] = None) -> Tuple[datetime, str]:
+        """When the session next changes, and the session that starts then."""
+        times, sessions, i = self._locate(self._timestamp(at))
+        return datetime.fromtimestamp(times[i + 1], self.tz), sessions[i + 1]
+
+    def seconds_until_transition(self, at: Optional[datetime] = None) -> float:
+        ts = self._timestamp(at)
+        times, _, i = self._locate(ts)
+        return times[i + 1] - ts
+
+    def seconds_since_transition(self, at: Optional[datetime] = None) -> float:
+        """Seconds since the session last changed."""
+        ts = self._timestamp(at)
+        times, _, i = self._locate(ts)
+        return ts - times[i]
+
+    def has_opened(self, at: Optional[datetime] = None) -> bool:
+        """Whether `at` falls on a trading day at or after its regular open."""
+        moment = datetime.now(self.tz) if at is None else at.astimezone(self.tz)
+        return self.is_trading_day(moment.date()) and moment.time() >= self.market_open
+
+    def next_open(self, at: Optional[datetime] = None) -> datetime:
+        """Start of the next regular session strictly after `at`."""
+        times, sessions, i = self._locate(self._timestamp(at))
+        for j in range(i + 1, len(times)):
+            if sessions[j] == self.REGULAR:
+                return datetime.fromtimestamp(times[j], self.tz)
+        # Past the end of the table: extend it and look again
+        return self.next_open(datetime.fromtimestamp(times[-1], self.tz))
@@ -0,0 +1,108 @@
+"""
+Incremental, deduplicated headline store.
+"""
+
+import re
+import bisect
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+
+def article_id(guid: Optional[str], link: Optional[str], title: Optional[str] = None) -> str:
+    """Stable hash identifying an article by GUID, falling back to link then title."""
+    identity = guid or link or title or ''
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+
+def normalize_title(title: str) -> str:
+    """Lowercased, punctuation-free title used to spot the same story across sources."""
+    return ' '.join(re.sub(r'[^a-z0-9 ]', ' ', title.lower()).split())
+
+
+class NewsStore:
+    """Headlines keyed by article identity with a time-ordered index.
+
+    Articles are identified by GUID/link. The same normalized title from
+    another source published within title_window of the stored copy is
+    the same story and collapsed into it; a recurring headline from the
+    same source, or from outside the window, is a new article. Articles
+    older than max_age or beyond max_items are aged out.
+    """
+
+    def __init__(self, max_items: int = 500, max_age: timedelta = timedelta(hours=48),
+                 title_window: timedelta = timedelta(hours=6)):
+        self.max_items = max_items
+        self.max_age = max_age
+        self.title_window = title_window
+        self._items: Dict[str, Dict] = {}
+        self._titles: Dict[str, str] = {}  # normalized title -> newest article id with it
+        self._index: List = []  # sorted (published iso, article id), oldest first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def contains(self, key: str) -> bool:
+        """Whether an article id is already stored."""
+        with self._lock:
+            return key in self._items
+
+    def merge(self, headlines: List[Dict]) -> int:
+        """Add new headlines, collapsing duplicates. Returns how many were new."""
+        added = 0
+        with self._lock:
+            for headline in headlines:
+                key = headline.get('id') or article_id(None, headline.get('link'),
+                                                       headline.get('title'))
+                title = normalize_title(headline.get('title', ''))
+                if key in self._items or self._same_story(self._items.get(self._titles.get(title)),
+                                                          headline):
+                    continue
+
+                headline = dict(headline, id=key)
+                self._items[key] = headline
+                newest = self._items.get(self._titles.get(title))
+                if title and (newest is None or newest['published'] <= headline['published']):
+                    self._titles[title] = key
+                bisect.insort(self._index, (headline['published'], key))
+                added += 1
+
+            self._age_out()
+        return added
+
+    def _same_story(self, stored: Optional[Dict], headline: Dict) -> bool:
+        """Whether a stored article with the same title is another source's copy of headline."""
+        if stored is None or stored.get('source') == headline.get('source'):
+            return False
+        try:
+            apart = abs(datetime.fromisoformat(stored['published'])
+                        - datetime.fromisoformat(headline['published']))
+        except (KeyError, TypeError, ValueError):
+            return False
+        return apart <= self.title_window
+
+    def latest(self, limit: int) -> List[Dict]:
+        """Newest headlines first."""
+        with self._lock:
+            return [self._items[key] for _, key in reversed(self._index[-limit:])]
+
+    def clear(self):
+        """Drop all headlines."""
+        with self._lock:
+            self._items = {}
+            self._titles = {}
+            self._index = []
+
+    def _age_out(self):
+        """Drop articles past max_age or beyond max_items (caller holds the lock)."""
+        cutoff = (datetime.now() - self.max_age).isoformat()
+        drop = bisect.bisect_left(self._index, (cutoff, ''))
+        drop = max(drop, len(self._index) - self.max_items)
+        for _, key in self._index[:drop]:
+            headline = self._items.pop(key)
+            title = normalize_title(headline.get('title', ''))
+            if self._titles.get(title) == key:
+                del self._titles[title]
+        del self._index[:drop]
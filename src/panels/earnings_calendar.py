@@ -17,6 +17,9 @@ class EarningsCalendarPanel(LabeledFrame):
         self.data_fetcher = data_fetcher
         self.earnings_widgets = []
 
+        # Re-render when stale data is refreshed in the background
+        data_fetcher.subscribe('calendar', self.update_data)
+
         # Create frame for earnings
         self.earnings_frame = tk.Frame(self, bg=COLORS['bg_secondary'])
         self.earnings_frame.pack(fill=tk.BOTH, expand=True)
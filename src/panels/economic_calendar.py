@@ -17,6 +17,9 @@ class EconomicCalendarPanel(LabeledFrame):
         self.data_fetcher = data_fetcher
         self.event_widgets = []
 
+        # Re-render when stale data is refreshed in the background
+        data_fetcher.subscribe('calendar', self.update_data)
+
         # Create frame for events
         self.events_frame = tk.Frame(self, bg=COLORS['bg_secondary'])
         self.events_frame.pack(fill=tk.BOTH, expand=True)
@@ -17,6 +17,9 @@ class MarketOverviewPanel(LabeledFrame):
         self.data_fetcher = data_fetcher
         self.quote_widgets = {}
 
+        # Re-render when stale data is refreshed in the background
+        data_fetcher.subscribe('quotes', self.update_data)
+
         # Create three-column layout
         columns_frame = tk.Frame(self, bg=COLORS['bg_secondary'])
         columns_frame.pack(fill=tk.BOTH, expand=True)
@@ -55,11 +58,18 @@ class MarketOverviewPanel(LabeledFrame):
             widget.pack(fill=tk.X)
             self.quote_widgets[symbol] = widget
 
+    def data_requests(self):
+        """Data this panel needs each refresh, for the fetcher's request planner."""
+        return {'quotes': self._symbols()}
+
+    def _symbols(self):
+        return list(INDICES.keys()) + list(VOLATILITY.keys()) + list(RATES_MACRO.keys())
+
     def update_data(self):
         """Fetch data (thread-safe) and schedule UI update on main thread."""
         try:
             # Collect all symbols
-            all_symbols = list(INDICES.keys()) + list(VOLATILITY.keys()) + list(RATES_MACRO.keys())
+            all_symbols = self._symbols()
 
             # Fetch quotes in batch (thread-safe)
             quotes = self.data_fetcher.get_quotes_batch(all_symbols)
@@ -3,7 +3,7 @@ Biggest Movers Panel - displays top gainers and losers.
 """
 
 import tkinter as tk
-from config import TOP_MOVERS_COUNT, COLORS, FONTS
+from config import TOP_MOVERS_COUNT, MOVERS_UNIVERSE, COLORS, FONTS
 from ui_components import StockRow, LabeledFrame
 from utils import get_arrow_emoji, format_volume, log_error
 
@@ -17,6 +17,9 @@ class MoversPanel(LabeledFrame):
         self.data_fetcher = data_fetcher
         self.mover_widgets = {'gainers': [], 'losers': []}
 
+        # Re-render when stale data is refreshed in the background
+        data_fetcher.subscribe('quotes', self.update_data)
+
         # Create two-column layout
         columns_frame = tk.Frame(self, bg=COLORS['bg_secondary'])
         columns_frame.pack(fill=tk.BOTH, expand=True)
@@ -44,11 +47,16 @@ class MoversPanel(LabeledFrame):
             widget.pack(fill=tk.X)
             self.mover_widgets['losers'].append(widget)
 
+    def data_requests(self):
+        """Data this panel needs each refresh, for the fetcher's request planner."""
+        # Batched quotes carry market caps; the fetcher fills any gaps itself
+        return {'quotes': MOVERS_UNIVERSE}
+
     def update_data(self):
         """Fetch data (thread-safe) and schedule UI update on main thread."""
         try:
-            gainers = self.data_fetcher.get_top_movers(direction='gainers', limit=TOP_MOVERS_COUNT)
-            losers = self.data_fetcher.get_top_movers(direction='losers', limit=TOP_MOVERS_COUNT)
+            movers = self.data_fetcher.get_movers(limit=TOP_MOVERS_COUNT)
+            gainers, losers = movers['gainers'], movers['losers']
 
             self.after(0, lambda g=gainers, l=losers: self._render(g, l))
 
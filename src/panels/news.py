@@ -17,6 +17,9 @@ class NewsPanel(LabeledFrame):
         self.data_fetcher = data_fetcher
         self.news_widgets = []
 
+        # Re-render when stale data is refreshed in the background
+        data_fetcher.subscribe('news', self.update_data)
+
         # Create scrollable content area
         self.scrollable = ScrollableFrame(self)
         self.scrollable.pack(fill=tk.BOTH, expand=True)
@@ -17,6 +17,9 @@ class VolatilityHeatMapPanel(LabeledFrame):
         self.data_fetcher = data_fetcher
         self.iv_widgets = {}
 
+        # Re-render when stale data is refreshed in the background
+        data_fetcher.subscribe('iv', self.update_data)
+
         # Create grid layout for stocks
         grid_frame = tk.Frame(self, bg=COLORS['bg_secondary'])
         grid_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -35,6 +38,10 @@ class VolatilityHeatMapPanel(LabeledFrame):
             widget.pack(fill=tk.X)
             self.iv_widgets[stock] = widget
 
+    def data_requests(self):
+        """Data this panel needs each refresh, for the fetcher's request planner."""
+        return {'quotes': IV_STOCKS, 'iv': IV_STOCKS}
+
     def update_data(self):
         """Fetch data (thread-safe) and schedule UI update on main thread."""
         try:
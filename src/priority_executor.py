@@ -0,0 +1,93 @@
+"""
+Thread pool that runs queued work in priority order.
+"""
+
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+
+class PriorityExecutor:
+    """Fixed-size thread pool; queued work with the lowest priority number runs first.
+
+    Work of equal priority runs in submission order. Running work is never
+    interrupted, so priorities only decide who gets the next free worker.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "worker"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._queue = []  # heap of (priority, seq, future, fn, args)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._idle = 0
+        self._shutdown = False
+
+    def submit(self, fn: Callable, *args, priority: int = 0) -> Future:
+        """Queue fn(*args); raises RuntimeError after shutdown like ThreadPoolExecutor."""
+        future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            heapq.heappush(self._queue, (priority, next(self._seq), future, fn, args))
+            if self._idle == 0 and len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker, daemon=True,
+                                          name=f"{self.thread_name_prefix}_{len(self._threads)}")
+                self._threads.append(thread)
+                thread.start()
+            else:
+                self._cond.notify()
+        return future
+
+    def at(self, priority: int) -> "_PriorityView":
+        """An executor-like view whose submit() uses a fixed priority."""
+        return _PriorityView(self, priority)
+
+    def queued(self) -> int:
+        """Work waiting for a free worker."""
+        with self._cond:
+            return len(self._queue)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        with self._cond:
+            self._shutdown = True
+            if cancel_futures:
+                for _, _, future, _, _ in self._queue:
+                    future.cancel()
+                self._queue = []
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._idle += 1
+                while not self._queue and not self._shutdown:
+                    self._cond.wait()
+                self._idle -= 1
+                if not self._queue:
+                    return
+                _, _, future, fn, args = heapq.heappop(self._queue)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+
+class _PriorityView:
+    def __init__(self, executor: PriorityExecutor, priority: int):
+        self._executor = executor
+        self._priority = priority
+
+    def submit(self, fn: Callable, *args) -> Future:
+        return self._executor.submit(fn, *args, priority=self._priority)
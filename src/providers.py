@@ -0,0 +1,264 @@
+"""
+Pluggable market data providers with failover and hedged requests.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date as Date, datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import requests
+
+from utils import log_warning
+
+
+class Provider:
+    """A named data source and the capabilities it implements.
+
+    methods maps a capability ('quote', 'daily_closes', 'earnings_calendar')
+    to a callable. A callable returns None when it has no data; raising
+    counts as a failure.
+    """
+
+    def __init__(self, name: str, methods: Dict[str, Callable]):
+        self.name = name
+        self.methods = methods
+
+    def supports(self, method: str) -> bool:
+        return method in self.methods
+
+
+class ProviderRouter:
+    """Call a capability on providers in priority order, hedging slow ones.
+
+    The primary gets a head start equal to its recent p95 latency for
+    that capability; if it has not answered by then, the next provider is
+    fired as well and the first usable answer wins. Failures fail over to
+    the next provider immediately. Losing calls finish in the background
+    and their answers are discarded.
+
+    Calls run on the router's own pool. If given, context() is called on
+    the calling thread and returns run(fn, *args), which runs a provider
+    call on a pool thread with the caller's context (priority, prepaid
+    rate-limit tokens) restored.
+    """
+
+    def __init__(self, providers: List[Provider], priority: Dict[str, List[str]],
+                 default_delay: float = 1.5, min_delay: float = 0.2, max_delay: float = 5.0,
+                 quantile: float = 0.95, window: int = 50, min_samples: int = 5,
+                 timeout: float = 15.0, max_workers: int = 8,
+                 context: Optional[Callable[[], Callable]] = None):
+        self.providers = {provider.name: provider for provider in providers}
+        self.priority = priority
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.quantile = quantile
+        self.window = window
+        self.min_samples = min_samples
+        self.timeout = timeout
+        self.context = context
+        self._latencies = {}  # (provider, method) -> deque of seconds
+        self._wins = {}  # (provider, method) -> calls answered first
+        self._lock = threading.Lock()
+        # Own pool so hedges never wait behind the batch workers that call us
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="provider")
+
+    def candidates(self, method: str) -> List[Provider]:
+        """Registered providers for a capability, in priority order."""
+        return [self.providers[name] for name in self.priority.get(method, [])
+                if name in self.providers and self.providers[name].supports(method)]
+
+    def hedge_delay(self, provider: str, method: str) -> float:
+        """How long to wait on a provider before firing the next one."""
+        with self._lock:
+            samples = list(self._latencies.get((provider, method), ()))
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        delay = float(np.quantile(samples, self.quantile))
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def _timed(self, provider: Provider, method: str, args: tuple, run: Optional[Callable]):
+        start = time.monotonic()
+        fn = provider.methods[method]
+        result = run(fn, *args) if run else fn(*args)
+        if result is not None:
+            with self._lock:
+                self._latencies.setdefault(
+                    (provider.name, method), deque(maxlen=self.window)
+                ).append(time.monotonic() - start)
+        return result
+
+    def call(self, method: str, *args):
+        """First usable answer for a capability, or None if every provider failed."""
+        candidates = self.candidates(method)
+        if not candidates:
+            return None
+
+        run = self.context() if self.context else None
+        deadline = time.monotonic() + self.timeout
+        pending = {}  # future -> provider
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            provider = candidates[launched]
+            launched += 1
+            try:
+                pending[self.executor.submit(self._timed, provider, method, args, run)] = provider
+            except RuntimeError:
+                # Router closed (app shutting down)
+                pass
+
+        launch()
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                log_warning(f"{method}{args} timed out on {[p.name for p in pending.values()]}")
+                return None
+
+            timeout = remaining
+            if launched < len(candidates):
+                timeout = min(timeout, self.hedge_delay(candidates[launched - 1].name, method))
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if launched < len(candidates):
+                    launch()  # hedge
+                continue
+
+            failed = False
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    log_warning(f"{provider.name} {method}{args} failed: {str(e)}")
+                    result = None
+                if result is not None:
+                    with self._lock:
+                        key = (provider.name, method)
+                        self._wins[key] = self._wins.get(key, 0) + 1
+                    return result
+                failed = True
+
+            if failed and launched < len(candidates):
+                launch()  # fail over
+
+        return None
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per provider/capability p95 latency, samples and wins."""
+        with self._lock:
+            keys = set(self._latencies) | set(self._wins)
+            samples = {key: list(self._latencies.get(key, ())) for key in keys}
+            wins = dict(self._wins)
+        return {
+            f"{provider}.{method}": {
+                'p95': round(float(np.quantile(samples[(provider, method)], self.quantile)), 3)
+                if samples[(provider, method)] else None,
+                'samples': len(samples[(provider, method)]),
+                'wins': wins.get((provider, method), 0),
+            }
+            for provider, method in keys
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def alpha_vantage_provider(session: requests.Session, url: str, api_key: str,
+                           upstream: Callable, timeout) -> Provider:
+    """Alpha Vantage quotes and daily closes (free tier: 5 calls/min).
+
+    upstream(name, fn) makes the request (rate limiting, retries, breaker).
+    """
+
+    def get(params: Dict) -> Optional[Dict]:
+        def request():
+            response = session.get(url, params=dict(params, apikey=api_key), timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+            # Quota and key errors come back as 200s with a message instead of data
+            if 'Note' in data or 'Information' in data or 'Error Message' in data:
+                raise RuntimeError(data.get('Note') or data.get('Information')
+                                   or data['Error Message'])
+            return data
+
+        return upstream('alpha_vantage', request)
+
+    def quote(symbol: str) -> Optional[Dict]:
+        data = get({'function': 'GLOBAL_QUOTE', 'symbol': symbol}).get('Global Quote') or {}
+        if not data.get('05. price'):
+            return None
+        return {
+            'symbol': symbol,
+            'price': float(data['05. price']),
+            'change': float(data.get('09. change', 0)),
+            'change_pct': float(data.get('10. change percent', '0%').rstrip('%')),
+            'volume': int(data.get('06. volume', 0)),
+            'market_cap': 0,
+            'timestamp': datetime.now().isoformat(),
+        }
+
+    def daily_closes(symbol: str, start: Optional[Date] = None) -> Optional[pd.Series]:
+        series = get({'function': 'TIME_SERIES_DAILY', 'symbol': symbol,
+                      'outputsize': 'compact'}).get('Time Series (Daily)')
+        if not series:
+            return None
+        closes = pd.Series({pd.Timestamp(day): float(bar['4. close'])
+                            for day, bar in series.items()}).sort_index()
+        if start is not None:
+            closes = closes[closes.index >= pd.Timestamp(start)]
+        return closes
+
+    return Provider('alpha_vantage', {'quote': quote, 'daily_closes': daily_closes})
+
+
+def finnhub_provider(session: requests.Session, url: str, api_key: str,
+                     upstream: Callable, timeout, earnings_symbols: List[str]) -> Provider:
+    """Finnhub quotes and earnings calendar (free tier: 60 calls/min).
+
+    upstream(name, fn) makes the request (rate limiting, retries, breaker).
+    """
+
+    def get(path: str, params: Dict) -> Dict:
+        def request():
+            response = session.get(f"{url}{path}", params=dict(params, token=api_key),
+                                   timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+
+        return upstream('finnhub', request)
+
+    def quote(symbol: str) -> Optional[Dict]:
+        data = get('/quote', {'symbol': symbol})
+        if not data.get('c'):
+            return None
+        return {
+            'symbol': symbol,
+            'price': data['c'],
+            'change': data.get('d') or 0,
+            'change_pct': data.get('dp') or 0,
+            'volume': 0,  # not part of Finnhub's quote
+            'market_cap': 0,
+            'timestamp': datetime.now().isoformat(),
+        }
+
+    def earnings_calendar(date: str) -> Optional[Dict[str, List[str]]]:
+        data = get('/calendar/earnings', {'from': date, 'to': date})
+        before_open, after_close = [], []
+        for report in data.get('earningsCalendar') or []:
+            if report.get('symbol') not in earnings_symbols:
+                continue
+            if report.get('hour') == 'bmo':
+                before_open.append(report['symbol'])
+            else:
+                after_close.append(report['symbol'])
+        return {'before_open': before_open, 'after_close': after_close}
+
+    return Provider('finnhub', {'quote': quote, 'earnings_calendar': earnings_calendar})
@@ -0,0 +1,175 @@
+"""
+Columnar in-memory quote table for universe-wide scans.
+"""
+
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+class QuoteStore:
+    """Quotes held as NumPy columns indexed by an interned symbol ID.
+
+    Screening, filtering and top-k selection run as vectorized operations
+    over the columns instead of sorting lists of quote dicts.
+    """
+
+    COLUMNS = ('price', 'change', 'change_pct', 'volume', 'market_cap', 'timestamp')
+
+    def __init__(self, capacity: int = 64):
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._lock = threading.RLock()
+        self._columns = {name: np.full(capacity, np.nan) for name in self.COLUMNS}
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def symbol_id(self, symbol: str) -> int:
+        """Get the ID for a symbol, assigning one on first sight."""
+        with self._lock:
+            symbol_id = self._ids.get(symbol)
+            if symbol_id is None:
+                symbol_id = len(self._symbols)
+                self._ids[sys.intern(symbol)] = symbol_id
+                self._symbols.append(symbol)
+                self._grow(symbol_id + 1)
+            return symbol_id
+
+    def ids(self, symbols: List[str]) -> np.ndarray:
+        """IDs of the given symbols that have a row in the store."""
+        with self._lock:
+            return np.array([self._ids[s] for s in symbols if s in self._ids], dtype=np.intp)
+
+    def symbols(self, ids: np.ndarray) -> List[str]:
+        """Symbols for an array of IDs."""
+        return [self._symbols[i] for i in ids]
+
+    def update(self, quote: Dict):
+        """Write a quote dict into its row."""
+        symbol_id = self.symbol_id(quote['symbol'])
+        timestamp = quote.get('timestamp')
+        with self._lock:
+            for name in ('price', 'change', 'change_pct', 'volume', 'market_cap'):
+                value = quote.get(name)
+                self._columns[name][symbol_id] = value if value is not None else np.nan
+            self._columns['timestamp'][symbol_id] = (
+                datetime.fromisoformat(timestamp).timestamp() if timestamp else np.nan
+            )
+
+    def set_market_cap(self, symbol: str, market_cap: float):
+        """Update only the market cap of a symbol."""
+        symbol_id = self.symbol_id(symbol)
+        with self._lock:
+            self._columns['market_cap'][symbol_id] = market_cap
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Rebuild the quote dict for a symbol."""
+        with self._lock:
+            symbol_id = self._ids.get(symbol)
+            if symbol_id is None:
+                return None
+            return self._row(symbol_id)
+
+    def quotes(self, ids: np.ndarray) -> List[Dict]:
+        """Rebuild quote dicts for an array of IDs, in order."""
+        with self._lock:
+            return [self._row(i) for i in ids]
+
+    def screen(self, ids: np.ndarray, min_market_cap: float = 0) -> np.ndarray:
+        """IDs with a price and a market cap above min_market_cap."""
+        with self._lock:
+            price = self._columns['price'][ids]
+            market_cap = self._columns['market_cap'][ids]
+        return ids[np.isfinite(price) & (np.nan_to_num(market_cap) > min_market_cap)]
+
+    def top_k(self, ids: np.ndarray, k: int, column: str = 'change_pct',
+              largest: bool = True) -> np.ndarray:
+        """IDs of the k largest (or smallest) values of a column, best first, in O(n)."""
+        with self._lock:
+            values = self._columns[column][ids]
+        finite = np.isfinite(values)
+        ids, values = ids[finite], values[finite]
+        if largest:
+            values = -values
+
+        k = min(k, len(ids))
+        if k <= 0:
+            return ids[:0]
+        part = np.argpartition(values, k - 1)[:k]
+        return ids[part[np.argsort(values[part], kind='stable')]]
+
+    def top_bottom_k(self, ids: np.ndarray, k: int,
+                     column: str = 'change_pct') -> Tuple[np.ndarray, np.ndarray]:
+        """IDs of the k largest and k smallest values of a column from one partition pass.
+
+        Returns (largest first, smallest first).
+        """
+        with self._lock:
+            values = self._columns[column][ids]
+        finite = np.isfinite(values)
+        ids, values = ids[finite], values[finite]
+
+        n = len(ids)
+        k = min(k, n)
+        if k <= 0:
+            return ids[:0], ids[:0]
+        if 2 * k >= n:
+            order = np.argsort(values, kind='stable')
+            return ids[order[::-1][:k]], ids[order[:k]]
+
+        # One introselect pins both the k-th smallest and the k-th largest positions
+        part = np.argpartition(values, [k - 1, n - k])
+        bottom, top = part[:k], part[n - k:]
+        bottom = bottom[np.argsort(values[bottom], kind='stable')]
+        top = top[np.argsort(-values[top], kind='stable')]
+        return ids[top], ids[bottom]
+
+    def breadth(self, ids: np.ndarray) -> Dict[str, int]:
+        """Advancing, declining and unchanged counts."""
+        with self._lock:
+            change = self._columns['change_pct'][ids]
+        change = change[np.isfinite(change)]
+        return {
+            'advancers': int(np.count_nonzero(change > 0)),
+            'decliners': int(np.count_nonzero(change < 0)),
+            'unchanged': int(np.count_nonzero(change == 0)),
+        }
+
+    def clear(self):
+        """Drop all rows."""
+        with self._lock:
+            self._ids = {}
+            self._symbols = []
+            for column in self._columns.values():
+                column.fill(np.nan)
+
+    def _row(self, symbol_id: int) -> Dict:
+        """Quote dict for a row (caller holds the lock)."""
+        columns = self._columns
+        timestamp = columns['timestamp'][symbol_id]
+        volume = columns['volume'][symbol_id]
+        market_cap = columns['market_cap'][symbol_id]
+        return {
+            'symbol': self._symbols[symbol_id],
+            'price': float(columns['price'][symbol_id]),
+            'change': float(np.nan_to_num(columns['change'][symbol_id])),
+            'change_pct': float(np.nan_to_num(columns['change_pct'][symbol_id])),
+            'volume': int(volume) if np.isfinite(volume) else 0,
+            'market_cap': float(market_cap) if np.isfinite(market_cap) else 0,
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat() if np.isfinite(timestamp) else None,
+        }
+
+    def _grow(self, size: int):
+        """Double column capacity until it holds `size` rows (caller holds the lock)."""
+        capacity = len(self._columns['price'])
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.full(capacity, np.nan)
+            grown[:len(column)] = column
+            self._columns[name] = grown
@@ -0,0 +1,198 @@
+"""
+Token-bucket rate limiting per data provider.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Token bucket refilled at a steady rate, allowing bursts up to capacity.
+
+    Reservations may take the bucket below zero; each one is told how long
+    to wait for its tokens, so queued callers are served in FIFO order
+    without anyone sleeping while holding the lock.
+    """
+
+    def __init__(self, calls_per_minute: float, burst: int):
+        self.rate = calls_per_minute / 60.0  # tokens per second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._pending = deque()  # ready times of reservations not yet due
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: int = 1) -> float:
+        """Take tokens now and return how many seconds until they may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            delay = max(0.0, -self._tokens / self.rate)
+            if delay > 0:
+                self._pending.append(now + delay)
+            return delay
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take tokens only if they are available right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available; False if that would exceed timeout."""
+        if timeout is not None:
+            with self._lock:
+                self._refill(time.monotonic())
+                if (tokens - self._tokens) / self.rate > timeout:
+                    return False
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    @property
+    def available(self) -> float:
+        """Tokens available now (negative while reservations are queued)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    @property
+    def queue_depth(self) -> int:
+        """Reservations still waiting for their tokens."""
+        with self._lock:
+            now = time.monotonic()
+            while self._pending and self._pending[0] <= now:
+                self._pending.popleft()
+            return len(self._pending)
+
+
+class RateLimiter:
+    """Token buckets per provider, plus delayed dispatch onto an executor.
+
+    Providers without a configured limit are never throttled.
+    """
+
+    def __init__(self, limits: Dict[str, float], bursts: Optional[Dict[str, int]] = None):
+        bursts = bursts or {}
+        self.buckets = {
+            provider: TokenBucket(rate, bursts.get(provider, int(rate)))
+            for provider, rate in limits.items()
+        }
+        self._timers = []  # heap of (due, seq, dispatch)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._dispatcher = None
+        self._closed = False
+
+    def reserve(self, provider: str, tokens: int = 1) -> float:
+        """Reserve capacity; returns seconds to wait before making the call."""
+        bucket = self.buckets.get(provider)
+        return bucket.reserve(tokens) if bucket else 0.0
+
+    def try_acquire(self, provider: str, tokens: int = 1) -> bool:
+        """Take capacity only if it is available right now."""
+        bucket = self.buckets.get(provider)
+        return bucket.try_acquire(tokens) if bucket else True
+
+    def acquire(self, provider: str, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """Block the calling thread until capacity is available."""
+        bucket = self.buckets.get(provider)
+        return bucket.acquire(tokens, timeout) if bucket else True
+
+    def submit(self, provider: str, executor: Executor, fn: Callable, *args,
+               tokens: int = 1) -> Future:
+        """Run fn(*args) on executor once the provider has `tokens` of capacity.
+
+        Calls that must wait are parked on a single timer thread instead
+        of occupying an executor worker while they sleep.
+        """
+        delay = self.reserve(provider, tokens)
+        if delay <= 0:
+            return executor.submit(fn, *args)
+
+        proxy = Future()
+
+        def dispatch():
+            try:
+                inner = executor.submit(fn, *args)
+            except RuntimeError as e:
+                # Executor shut down while the call was queued
+                proxy.set_exception(e)
+                return
+            inner.add_done_callback(lambda done: _copy_result(done, proxy))
+
+        with self._cond:
+            heapq.heappush(self._timers, (time.monotonic() + delay, next(self._seq), dispatch))
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._run, daemon=True,
+                                                    name="rate-limiter")
+                self._dispatcher.start()
+            self._cond.notify()
+        return proxy
+
+    def _run(self):
+        """Dispatch queued calls as their reservations come due."""
+        while True:
+            with self._cond:
+                while not self._closed and (
+                        not self._timers or self._timers[0][0] > time.monotonic()):
+                    timeout = self._timers[0][0] - time.monotonic() if self._timers else None
+                    self._cond.wait(timeout)
+                if self._closed:
+                    return
+                _, _, dispatch = heapq.heappop(self._timers)
+            dispatch()
+
+    def queue_depth(self, provider: str) -> int:
+        """Reservations for a provider still waiting for capacity."""
+        bucket = self.buckets.get(provider)
+        return bucket.queue_depth if bucket else 0
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-provider rate, available tokens and queue depth."""
+        return {
+            provider: {
+                'calls_per_minute': bucket.rate * 60,
+                'burst': bucket.capacity,
+                'available': round(bucket.available, 2),
+                'queue_depth': bucket.queue_depth,
+            }
+            for provider, bucket in self.buckets.items()
+        }
+
+    def close(self):
+        """Stop the dispatcher, handing queued calls to their executors now.
+
+        Once the executor itself is shut down those calls fail with
+        RuntimeError instead of leaving their futures pending forever.
+        """
+        with self._cond:
+            self._closed = True
+            timers, self._timers = self._timers, []
+            self._cond.notify()
+        for _, _, dispatch in sorted(timers):
+            dispatch()
+
+
+def _copy_result(source: Future, target: Future):
+    """Propagate a finished future's outcome to another future."""
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
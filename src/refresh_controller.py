@@ -0,0 +1,93 @@
+"""
+Adaptive refresh intervals driven by how fast panel data is changing.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils import log_info, log_warning
+
+
+class AdaptiveRefreshController:
+    """Scale each panel's refresh interval by how much its data moved.
+
+    After every refresh, observe() compares a panel's {symbol: value} with
+    its previous refresh. A median absolute move per minute at or above
+    busy_move_pct divides the panel's factor by step; at or below
+    calm_move_pct multiplies it by step. Factors stay within
+    [min_factor, max_factor] and callers multiply their base interval by
+    them. An alert value (the VIX) moving alert_threshold or more between
+    observations drops every panel to min_factor at once.
+    """
+
+    def __init__(self, min_factor: float = 0.25, max_factor: float = 4.0,
+                 calm_move_pct: float = 0.02, busy_move_pct: float = 0.10,
+                 step: float = 1.5, alert_threshold: float = 0.05):
+        self.min_factor = min_factor
+        self.max_factor = max_factor
+        self.calm_move_pct = calm_move_pct
+        self.busy_move_pct = busy_move_pct
+        self.step = step
+        self.alert_threshold = alert_threshold
+        self._factors: Dict[str, float] = {}
+        self._last = {}  # panel -> (time.monotonic(), {symbol: value})
+        self._alert_value = None
+        self._lock = threading.Lock()
+
+    def factor(self, name: str) -> float:
+        """Multiplier for a panel's base refresh interval (1.0 until observed)."""
+        with self._lock:
+            return self._factors.get(name, 1.0)
+
+    def observe(self, name: str, values: Dict[str, float],
+                alert_value: Optional[float] = None) -> bool:
+        """Record a panel's values after a refresh; True if the alert value spiked."""
+        now = time.monotonic()
+        with self._lock:
+            previous = self._last.get(name)
+            self._last[name] = (now, values)
+
+            last_alert = self._alert_value
+            if alert_value:
+                self._alert_value = alert_value
+            if alert_value and last_alert and abs(alert_value / last_alert - 1) >= self.alert_threshold:
+                for panel in self._last:
+                    self._factors[panel] = self.min_factor
+                log_warning(f"Alert value moved {alert_value / last_alert - 1:+.1%}; "
+                            f"refreshing all adaptive panels at x{self.min_factor}")
+                return True
+
+            if previous is None:
+                return False
+            move = self._move_per_minute(previous[1], values, now - previous[0])
+            if move is None:
+                return False
+
+            factor = self._factors.get(name, 1.0)
+            if move >= self.busy_move_pct:
+                factor = max(self.min_factor, factor / self.step)
+            elif move <= self.calm_move_pct:
+                factor = min(self.max_factor, factor * self.step)
+            if factor != self._factors.get(name, 1.0):
+                log_info(f"Adaptive refresh: {name} x{factor:.2f} "
+                         f"(median move {move:.3f}%/min)")
+            self._factors[name] = factor
+            return False
+
+    @staticmethod
+    def _move_per_minute(before: Dict[str, float], after: Dict[str, float],
+                         elapsed: float) -> Optional[float]:
+        """Median absolute % change of the symbols seen both times, per minute."""
+        moves = [abs(after[symbol] / before[symbol] - 1) * 100
+                 for symbol in after if before.get(symbol)]
+        if not moves:
+            return None
+        return float(np.median(moves)) / max(elapsed / 60, 1 / 60)
+
+    def stats(self) -> Dict[str, float]:
+        """Current interval factor per observed panel."""
+        with self._lock:
+            return {name: round(self._factors.get(name, 1.0), 3) for name in self._last}
@@ -0,0 +1,122 @@
+"""
+Plan a refresh cycle's upstream calls across providers.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional
+
+from rate_limiter import RateLimiter
+
+
+class RequestPlan:
+    """The upstream calls for one refresh cycle, plus what was skipped.
+
+    calls: [{'provider', 'kind', 'symbols', 'cost'}] in execution order
+    cached: {kind: [symbols]} already served by the cache
+    deferred: {kind: [symbols]} left out because no provider had quota
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.cached = {}
+        self.deferred = {}
+
+    def expected_cost(self) -> Dict[str, int]:
+        """Rate-limited calls the plan will spend, per provider."""
+        cost = {}
+        for call in self.calls:
+            cost[call['provider']] = cost.get(call['provider'], 0) + call['cost']
+        return cost
+
+    def summary(self) -> Dict:
+        """Counts suitable for logging or display."""
+        return {
+            'calls': len(self.calls),
+            'symbols_per_call': [len(call['symbols']) for call in self.calls],
+            'expected_cost': self.expected_cost(),
+            'cached': {kind: len(symbols) for kind, symbols in self.cached.items()},
+            'deferred': {kind: len(symbols) for kind, symbols in self.deferred.items()},
+        }
+
+
+class RequestPlanner:
+    """Group every panel's data requests into the fewest upstream calls.
+
+    batch_limits maps provider -> {kind: max symbols per call}; kinds are
+    planned in the order they first appear there, so dependencies (quotes
+    before the IV that reads their live prices) come first. Providers are
+    tried largest batch first and only while they have rate-limit tokens
+    left. A call costs one token, or one per symbol for the kinds listed
+    in per_symbol_cost (batches the provider serves one request per symbol).
+    """
+
+    def __init__(self, batch_limits: Dict[str, Dict[str, int]],
+                 rate_limiter: Optional[RateLimiter] = None,
+                 per_symbol_cost: Optional[Dict[str, List[str]]] = None):
+        self.batch_limits = batch_limits
+        self.rate_limiter = rate_limiter
+        self.per_symbol_cost = per_symbol_cost or {}
+        self.kinds = []
+        for limits in batch_limits.values():
+            self.kinds.extend(kind for kind in limits if kind not in self.kinds)
+
+    def _remaining_quota(self) -> Dict[str, float]:
+        """Calls each provider can make right now without queueing."""
+        remaining = {}
+        for provider in self.batch_limits:
+            bucket = self.rate_limiter.buckets.get(provider) if self.rate_limiter else None
+            remaining[provider] = max(0, math.floor(bucket.available)) if bucket else math.inf
+        return remaining
+
+    def plan(self, requests: List[Dict[str, List[str]]],
+             is_cached: Callable[[str, str], bool]) -> RequestPlan:
+        """Build a plan from [{kind: [symbols]}], skipping cached symbols."""
+        wanted = {}
+        for request in requests:
+            for kind, symbols in request.items():
+                merged = wanted.setdefault(kind, {})
+                merged.update(dict.fromkeys(symbols))
+
+        plan = RequestPlan()
+        remaining = self._remaining_quota()
+        for kind in self.kinds:
+            symbols = list(wanted.get(kind, {}))
+            if not symbols:
+                continue
+
+            todo = []
+            for symbol in symbols:
+                if is_cached(kind, symbol):
+                    plan.cached.setdefault(kind, []).append(symbol)
+                else:
+                    todo.append(symbol)
+
+            providers = sorted(
+                (provider for provider, limits in self.batch_limits.items() if kind in limits),
+                key=lambda provider: -self.batch_limits[provider][kind]
+            )
+            for provider in providers:
+                size = self.batch_limits[provider][kind]
+                per_symbol = kind in self.per_symbol_cost.get(provider, ())
+                if per_symbol:
+                    # Quota buys symbols, not calls
+                    affordable = min(len(todo), remaining[provider])
+                    batches = [todo[i:min(i + size, affordable)] for i in range(0, affordable, size)]
+                else:
+                    affordable = min(math.ceil(len(todo) / size), remaining[provider])
+                    batches = [todo[i * size:(i + 1) * size] for i in range(affordable)]
+                for symbols in batches:
+                    cost = len(symbols) if per_symbol else 1
+                    plan.calls.append({
+                        'provider': provider,
+                        'kind': kind,
+                        'symbols': tuple(symbols),
+                        'cost': cost,
+                    })
+                    remaining[provider] -= cost
+                todo = todo[sum(len(symbols) for symbols in batches):]
+
+            if todo:
+                plan.deferred[kind] = todo
+
+        return plan
@@ -0,0 +1,277 @@
+"""
+Per-panel refresh scheduling on a persistent worker pool.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, wait
+from typing import Callable, Dict, List, Optional
+
+from priority_executor import PriorityExecutor
+from utils import log_error
+
+
+class _Job:
+    def __init__(self, job: Callable, interval: Callable[[], float], prepared: bool,
+                 priority: int):
+        self.job = job
+        self.interval = interval
+        self.prepared = prepared
+        self.priority = priority
+        self.due = 0.0
+        self.running = False
+        self.deferred = False
+
+
+class _Batch:
+    def __init__(self, names: List[str], priorities: Dict[str, int], budget: float):
+        self.names = names
+        self.priorities = priorities
+        self.started = time.monotonic()
+        self.deadline = self.started + budget
+        self.pending = set(names)
+        self.ended = False
+        self.top = min(priorities.values())
+        self.first_paint = None
+        self.deferred = []
+
+    def ahead_of(self, priority: int) -> bool:
+        """Whether jobs of a higher class in this batch are still running."""
+        return any(self.priorities[name] < priority for name in self.pending)
+
+
+class RefreshScheduler:
+    """Run named jobs on their own cadences with a fixed pool of workers.
+
+    Each job is rescheduled interval() seconds after it finishes. Jobs due
+    within `coalesce` seconds of each other are dispatched as one batch,
+    bounded by `budget` seconds: on_batch_end(names, late) fires when every
+    job is done or at the deadline, whichever is first, and jobs still
+    running then report through on_late_done(still_late) as they finish.
+
+    Jobs added with prepared=True wait for prepare(names) (given a
+    time.monotonic() deadline of prepare_share of the budget) before
+    running, so a batch can share upstream calls.
+
+    Within a batch, jobs start in priority order (lower first) and each
+    class waits for the classes above it to finish, for at most
+    hold_share of the budget. A job that should_defer(name) then vetoes
+    is pushed back defer_delay seconds instead of running (never twice in
+    a row). Once every job has run, on_batch_timing(names, first_paint,
+    complete) reports the seconds until the top class was done and until
+    the whole batch was.
+    """
+
+    def __init__(self, max_workers: int = 8, budget: float = 5, coalesce: float = 1,
+                 prepare: Optional[Callable[[List[str], float], None]] = None,
+                 prepare_share: float = 0.6,
+                 on_batch_start: Optional[Callable[[List[str]], None]] = None,
+                 on_batch_end: Optional[Callable[[List[str], List[str]], None]] = None,
+                 on_late_done: Optional[Callable[[List[str]], None]] = None,
+                 hold_share: float = 0.4,
+                 should_defer: Optional[Callable[[str], bool]] = None,
+                 defer_delay: float = 10,
+                 on_batch_timing: Optional[Callable[[List[str], float, float], None]] = None):
+        self.budget = budget
+        self.coalesce = coalesce
+        self.prepare = prepare
+        self.prepare_share = prepare_share
+        self.on_batch_start = on_batch_start
+        self.on_batch_end = on_batch_end
+        self.on_late_done = on_late_done
+        self.hold_share = hold_share
+        self.should_defer = should_defer
+        self.defer_delay = defer_delay
+        self.on_batch_timing = on_batch_timing
+        self.executor = PriorityExecutor(max_workers, thread_name_prefix="refresh")
+        self._timings = deque(maxlen=20)
+        self._jobs: Dict[str, _Job] = {}
+        self._batches: List[_Batch] = []
+        self._late = set()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def add(self, name: str, job: Callable, interval: Callable[[], float], prepared: bool = False,
+            priority: int = 0):
+        """Register a job; it first runs when the scheduler starts."""
+        with self._cond:
+            self._jobs[name] = _Job(job, interval, prepared, priority)
+            self._cond.notify_all()
+
+    def start(self):
+        """Start the timer thread; every registered job is due immediately."""
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="scheduler")
+                self._thread.start()
+
+    def trigger(self, names: Optional[List[str]] = None):
+        """Make jobs due now (all by default); running jobs are left alone."""
+        with self._cond:
+            for name in names or list(self._jobs):
+                if name in self._jobs:
+                    self._jobs[name].due = 0.0
+            self._cond.notify_all()
+
+    def in_flight(self) -> List[str]:
+        """Names of jobs currently running."""
+        with self._cond:
+            return [name for name, job in self._jobs.items() if job.running]
+
+    def next_due(self) -> Dict[str, float]:
+        """Seconds until each idle job runs again."""
+        now = time.monotonic()
+        with self._cond:
+            return {name: max(0.0, job.due - now)
+                    for name, job in self._jobs.items() if not job.running}
+
+    def timings(self) -> List[Dict]:
+        """Recent batches: names, seconds to first useful paint and to completion."""
+        with self._cond:
+            return list(self._timings)
+
+    def stop(self):
+        """Stop scheduling; running jobs finish in the background."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                expired = [batch for batch in self._batches if batch.deadline <= now]
+                due = [name for name, job in self._jobs.items()
+                       if not job.running and job.due <= now + self.coalesce]
+
+                if not expired and not due:
+                    wakeups = [batch.deadline for batch in self._batches]
+                    wakeups += [job.due - self.coalesce
+                                for job in self._jobs.values() if not job.running]
+                    self._cond.wait(max(0.0, min(wakeups) - now) if wakeups else None)
+                    continue
+
+                for batch in expired:
+                    self._batches.remove(batch)
+                    batch.ended = True
+                    self._late.update(batch.pending)
+                for name in due:
+                    self._jobs[name].running = True
+
+            for batch in expired:
+                self._notify(self.on_batch_end, batch.names, sorted(batch.pending))
+            if due:
+                self._dispatch(due)
+
+    def _dispatch(self, names: List[str]):
+        """Start one batch of due jobs, highest priority first."""
+        names = sorted(names, key=lambda name: self._jobs[name].priority)
+        batch = _Batch(names, {name: self._jobs[name].priority for name in names}, self.budget)
+        with self._cond:
+            self._batches.append(batch)
+            self._cond.notify_all()
+        self._notify(self.on_batch_start, names)
+
+        prepared = [name for name in names if self._jobs[name].prepared]
+        ready = None
+        if prepared and self.prepare:
+            prepare_deadline = time.monotonic() + self.budget * self.prepare_share
+            ready = self._submit(batch.priorities[prepared[0]],
+                                 self._safe, self.prepare, prepared, prepare_deadline)
+
+        for name in names:
+            waits_on = ready if self._jobs[name].prepared else None
+            if self._submit(batch.priorities[name], self._run_job, name, batch, waits_on) is None:
+                self._finish(name, batch)
+
+    def _submit(self, priority: int, fn: Callable, *args) -> Optional[Future]:
+        try:
+            return self.executor.submit(fn, *args, priority=priority)
+        except RuntimeError:
+            return None  # stopped
+
+    def _run_job(self, name: str, batch: _Batch, ready: Optional[Future]):
+        job = self._jobs[name]
+        deferred = False
+        try:
+            self._hold(batch, job.priority)
+            if self.should_defer and not job.deferred and self.should_defer(name):
+                deferred = True
+                return
+            if ready is not None:
+                wait([ready], timeout=max(0.0, batch.deadline - time.monotonic()))
+            job.job()
+        except Exception as e:
+            log_error(f"Error refreshing {name}", e)
+        finally:
+            job.deferred = deferred
+            self._finish(name, batch, deferred)
+
+    def _hold(self, batch: _Batch, priority: int):
+        """Wait until higher classes in the batch are done, up to hold_share of the budget."""
+        until = batch.started + self.budget * self.hold_share
+        with self._cond:
+            while not self._stopped and batch.ahead_of(priority):
+                remaining = until - time.monotonic()
+                if remaining <= 0:
+                    return
+                self._cond.wait(remaining)
+
+    def _finish(self, name: str, batch: _Batch, deferred: bool = False):
+        """Reschedule a finished job and close its batch if it was the last one."""
+        ended = late_done = timing = None
+        with self._cond:
+            now = time.monotonic()
+            job = self._jobs[name]
+            job.running = False
+            job.due = now + (self.defer_delay if deferred else job.interval())
+            batch.pending.discard(name)
+            if deferred:
+                batch.deferred.append(name)
+            if batch.first_paint is None and not batch.ahead_of(batch.top + 1):
+                batch.first_paint = now - batch.started
+            if not batch.pending:
+                timing = {
+                    'names': batch.names,
+                    'first_paint': round(batch.first_paint, 3),
+                    'complete': round(now - batch.started, 3),
+                    'deferred': batch.deferred,
+                }
+                self._timings.append(timing)
+
+            if not batch.ended and not batch.pending:
+                batch.ended = True
+                self._batches.remove(batch)
+                ended = batch.names
+            elif name in self._late:
+                self._late.discard(name)
+                late_done = sorted(self._late)
+            self._cond.notify_all()
+
+        if ended is not None:
+            self._notify(self.on_batch_end, ended, [])
+        if late_done is not None:
+            self._notify(self.on_late_done, late_done)
+        if timing is not None:
+            self._notify(self.on_batch_timing, timing['names'], timing['first_paint'],
+                         timing['complete'])
+
+    def _safe(self, fn: Callable, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            log_error("Error preparing refresh batch", e)
+
+    @staticmethod
+    def _notify(callback: Optional[Callable], *args):
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            log_error("Error in scheduler callback", e)
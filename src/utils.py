@@ -5,7 +5,12 @@ Utility functions for the Markets Dashboard.
 import logging
 from datetime import datetime, time
 import pytz
-from config import LOG_FILE, LOG_LEVEL
+from config import (
+    LOG_FILE, LOG_LEVEL, MARKET_HOLIDAYS, MARKET_EARLY_CLOSES,
+    MARKET_OPEN_HOUR, MARKET_OPEN_MINUTE, MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE,
+    PREMARKET_START_HOUR, PREMARKET_START_MINUTE, AFTERHOURS_END_HOUR, AFTERHOURS_END_MINUTE
+)
+from market_clock import MarketClock
 
 # Set up logging
 logging.basicConfig(
@@ -18,61 +23,51 @@ logger = logging.getLogger(__name__)
 # Eastern Time Zone
 ET = pytz.timezone('US/Eastern')
 
+# Session table for the exchange calendar, shared by every caller
+session_clock = MarketClock(
+    MARKET_HOLIDAYS, MARKET_EARLY_CLOSES, tz='US/Eastern',
+    premarket_start=time(PREMARKET_START_HOUR, PREMARKET_START_MINUTE),
+    market_open=time(MARKET_OPEN_HOUR, MARKET_OPEN_MINUTE),
+    market_close=time(MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE),
+    after_hours_end=time(AFTERHOURS_END_HOUR, AFTERHOURS_END_MINUTE),
+)
+
+MARKET_STATUS = {
+    MarketClock.REGULAR: "MARKET OPEN",
+    MarketClock.PREMARKET: "PREMARKET",
+    MarketClock.AFTER_HOURS: "AFTER HOURS",
+    MarketClock.CLOSED: "CLOSED",
+}
+
 
 def get_current_et_time():
     """Get current time in Eastern Time."""
     return datetime.now(ET)
 
 
-def is_market_hours():
-    """Check if current time is during market hours (9:30 AM - 4:00 PM ET)."""
-    now = get_current_et_time()
-    market_open = time(9, 30)
-    market_close = time(16, 0)
+def get_market_session():
+    """Current session: 'premarket', 'regular', 'after_hours' or 'closed'."""
+    return session_clock.session()
 
-    # Only during weekdays
-    if now.weekday() >= 5:  # Saturday=5, Sunday=6
-        return False
 
-    return market_open <= now.time() < market_close
+def is_market_hours():
+    """Check if the regular session is open (9:30 AM - 4:00 PM ET, holidays aware)."""
+    return get_market_session() == MarketClock.REGULAR
 
 
 def is_premarket():
-    """Check if current time is premarket (7:00 AM - 9:30 AM ET)."""
-    now = get_current_et_time()
-    premarket_start = time(7, 0)
-    market_open = time(9, 30)
-
-    # Only during weekdays
-    if now.weekday() >= 5:
-        return False
-
-    return premarket_start <= now.time() < market_open
+    """Check if current time is premarket (7:00 AM - 9:30 AM ET on trading days)."""
+    return get_market_session() == MarketClock.PREMARKET
 
 
 def is_after_hours():
-    """Check if current time is after hours (4:00 PM - 8:00 PM ET)."""
-    now = get_current_et_time()
-    market_close = time(16, 0)
-    after_hours_end = time(20, 0)
-
-    # Only during weekdays
-    if now.weekday() >= 5:
-        return False
-
-    return market_close <= now.time() < after_hours_end
+    """Check if current time is after hours (close - 8:00 PM ET on trading days)."""
+    return get_market_session() == MarketClock.AFTER_HOURS
 
 
 def get_market_status():
     """Get current market status as string."""
-    if is_market_hours():
-        return "MARKET OPEN"
-    elif is_premarket():
-        return "PREMARKET"
-    elif is_after_hours():
-        return "AFTER HOURS"
-    else:
-        return "CLOSED"
+    return MARKET_STATUS[get_market_session()]
 
 
 def format_currency(value):
@@ -131,9 +126,10 @@ def get_arrow_emoji(change_percent):
 
 def get_market_data_type():
     """Determine what type of data to show based on market hours."""
-    if is_market_hours():
+    session = get_market_session()
+    if session == MarketClock.REGULAR:
         return "live"
-    elif is_premarket() or is_after_hours():
+    elif session in (MarketClock.PREMARKET, MarketClock.AFTER_HOURS):
         return "premarket"
     else:
         return "previous_close"
@@ -215,24 +211,12 @@ def get_date_string(days_offset=0):
 
 
 def is_trading_day():
-    """Check if today is a trading day (weekday)."""
-    return get_current_et_time().weekday() < 5
+    """Check if today is a trading day (weekday, not an exchange holiday)."""
+    return session_clock.is_trading_day(get_current_et_time().date())
 
 
 def minutes_until_market_open():
-    """Get minutes until market opens."""
+    """Get minutes until the next regular session opens."""
     now = get_current_et_time()
-    if now.weekday() >= 5:  # Weekend
-        # Next Monday 9:30 AM
-        days_until_monday = 7 - now.weekday()
-        next_open = now.replace(day=now.day + days_until_monday, hour=9, minute=30, second=0, microsecond=0)
-    else:
-        # Tomorrow or today at 9:30 AM
-        if now.time() < time(9, 30):
-            next_open = now.replace(hour=9, minute=30, second=0, microsecond=0)
-        else:
-            next_open = (now.replace(hour=9, minute=30, second=0, microsecond=0) +
-                        __import__('datetime').timedelta(days=1))
-
-    time_diff = next_open - now
+    time_diff = session_clock.next_open(now) - now
     return int(time_diff.total_seconds() / 60)
@@ -0,0 +1,211 @@
+"""
+Incremental rolling-window volatility for the IV heat map.
+"""
+
+import math
+import warnings
+import threading
+from collections import deque
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from config import IV_SHORT_WINDOW, IV_LONG_WINDOW, TRADING_DAYS_PER_YEAR
+
+
+class RollingWindow:
+    """Fixed-size window of values with Welford running mean and variance."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value: float):
+        """Add a value, dropping the oldest once the window is full."""
+        if len(self.values) == self.size:
+            self.mean, self.m2 = _welford_remove(len(self.values), self.mean, self.m2,
+                                                 self.values.popleft())
+        self.values.append(value)
+        self.mean, self.m2 = _welford_add(len(self.values), self.mean, self.m2, value)
+
+    def std(self, extra: Optional[float] = None) -> float:
+        """Sample std of the window, optionally as if `extra` had been pushed."""
+        n, mean, m2 = len(self.values), self.mean, self.m2
+        if extra is not None:
+            if n == self.size:
+                mean, m2 = _welford_remove(n, mean, m2, self.values[0])
+                n -= 1
+            n += 1
+            mean, m2 = _welford_add(n, mean, m2, extra)
+        if n < 2:
+            return float('nan')
+        return math.sqrt(max(m2, 0.0) / (n - 1))
+
+
+def _welford_add(n: int, mean: float, m2: float, value: float) -> Tuple[float, float]:
+    """Fold value into (mean, m2); n is the count including value."""
+    delta = value - mean
+    mean += delta / n
+    return mean, m2 + delta * (value - mean)
+
+
+def _welford_remove(n: int, mean: float, m2: float, value: float) -> Tuple[float, float]:
+    """Remove value from (mean, m2); n is the count before removal."""
+    if n <= 1:
+        return 0.0, 0.0
+    new_mean = mean - (value - mean) / (n - 1)
+    return new_mean, m2 - (value - mean) * (value - new_mean)
+
+
+class SymbolVolatility:
+    """Rolling return statistics for one symbol over completed daily closes."""
+
+    def __init__(self):
+        self.short = RollingWindow(IV_SHORT_WINDOW)
+        self.long = RollingWindow(IV_LONG_WINDOW)
+        self.closes = deque(maxlen=IV_LONG_WINDOW + 1)  # (date, close) backing the windows
+        self.last_close = None
+        self.last_close_date = None
+        self.synced_on = None  # ET date the completed closes were last brought up to date
+        self.live_on = None  # ET date a bar for the current session was last seen
+
+    def add_close(self, close_date: date, close: float):
+        """Fold a completed daily close into the windows."""
+        if self.last_close_date is not None and close_date <= self.last_close_date:
+            return
+        if self.last_close:
+            ret = close / self.last_close - 1
+            self.short.push(ret)
+            self.long.push(ret)
+        self.closes.append((close_date, close))
+        self.last_close = close
+        self.last_close_date = close_date
+
+    def annualized(self, live_price: Optional[float] = None) -> Tuple[float, float]:
+        """(short, long) annualized volatility in percent, including a live return if given."""
+        live_return = None
+        if live_price and self.last_close:
+            live_return = live_price / self.last_close - 1
+        scale = math.sqrt(TRADING_DAYS_PER_YEAR) * 100
+        return self.short.std(live_return) * scale, self.long.std(live_return) * scale
+
+
+class VolatilityEngine:
+    """Per-symbol rolling volatility that is loaded once and updated incrementally.
+
+    Completed daily closes are folded into the windows as they appear;
+    today's bar is never folded in, only applied provisionally as a live
+    return so it can move during the session.
+    """
+
+    def __init__(self):
+        self._symbols: Dict[str, SymbolVolatility] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str) -> Optional[SymbolVolatility]:
+        """Get the stats for a symbol, or None if it has not been loaded."""
+        with self._lock:
+            return self._symbols.get(symbol)
+
+    def needs_sync(self, symbol: str, today: date, bar_expected: bool = True) -> bool:
+        """Whether history must be fetched: first load, a new day, or no session bar yet
+        today while one is expected (before the open or on a holiday there is none)."""
+        stats = self.get(symbol)
+        return (stats is None or stats.synced_on != today
+                or (bar_expected and stats.live_on != today))
+
+    def sync(self, symbol: str, closes: pd.Series, today: date) -> Optional[float]:
+        """Fold completed closes from a daily history and return today's live close, if any."""
+        with self._lock:
+            stats = self._symbols.setdefault(symbol, SymbolVolatility())
+            live_price = None
+            for timestamp, close in closes.dropna().items():
+                close_date = timestamp.date()
+                if close_date >= today:
+                    live_price = float(close)
+                else:
+                    stats.add_close(close_date, float(close))
+            stats.synced_on = today
+            if live_price is not None:
+                stats.live_on = today
+            return live_price
+
+    def last_close_date(self, symbol: str) -> Optional[date]:
+        """Date of the newest completed close for a symbol."""
+        stats = self.get(symbol)
+        return stats.last_close_date if stats else None
+
+    def close_matrix(self, symbols: List[str], live_prices: Dict[str, float],
+                     today: date) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """Aligned (dates x symbols) close matrix, with a row for today's live prices.
+
+        Symbols without a close on a date get NaN for it.
+        """
+        columns = []
+        with self._lock:
+            for symbol in symbols:
+                stats = self._symbols.get(symbol)
+                closes = list(stats.closes) if stats else []
+                if live_prices.get(symbol):
+                    closes.append((today, live_prices[symbol]))
+                columns.append(closes)
+
+        dates = sorted({close_date for closes in columns for close_date, _ in closes})
+        row = {close_date: i for i, close_date in enumerate(dates)}
+        matrix = np.full((len(dates), len(symbols)), np.nan)
+        for j, closes in enumerate(columns):
+            for close_date, close in closes:
+                matrix[row[close_date], j] = close
+
+        return pd.DatetimeIndex(dates), matrix
+
+    def clear(self):
+        """Forget all symbols so the next request reloads full history."""
+        with self._lock:
+            self._symbols = {}
+
+
+def volatility_matrix(closes: np.ndarray, short_window: int = IV_SHORT_WINDOW,
+                      long_window: int = IV_LONG_WINDOW) -> Dict[str, np.ndarray]:
+    """Vectorized short/long annualized volatility for every column of a close matrix.
+
+    Each column uses its own last N valid daily returns, so NaN gaps from
+    misaligned calendars shorten nothing but the gap itself. Returns
+    arrays for 'short', 'long' (percent), 'ratio' ((short - long) / long)
+    and 'color' (the get_iv_color_code bucket).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = closes[1:] / closes[:-1] - 1
+
+    # Stable-sort NaNs to the top of each column so the last rows hold its newest valid returns
+    valid = ~np.isnan(returns)
+    order = np.argsort(valid, axis=0, kind='stable')
+    packed = np.take_along_axis(returns, order, axis=0)
+
+    scale = math.sqrt(TRADING_DAYS_PER_YEAR) * 100
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # Columns with < 2 returns give NaN
+        short = np.nanstd(packed[-short_window:], axis=0, ddof=1) * scale
+        long = np.nanstd(packed[-long_window:], axis=0, ddof=1) * scale
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = (short - long) / long
+
+    return {
+        'short': short,
+        'long': long,
+        'ratio': ratio,
+        'color': iv_color_codes(ratio),
+    }
+
+
+def iv_color_codes(ratio: np.ndarray) -> np.ndarray:
+    """Vectorized get_iv_color_code over an array of (current - avg) / avg ratios."""
+    codes = np.select(
+        [ratio > 0.10, ratio >= 0.05, ratio >= -0.05, ratio < -0.05],
+        ["🔥", "🟡", "⚪", "🔵"],
+        default="⚪"  # NaN/inf ratio (no average): neutral
+    )
+    codes[~np.isfinite(ratio)] = "⚪"
+    return codes
@@ -0,0 +1,96 @@
+"""
+Tests for circuit breakers and jittered retries (run with pytest).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import time
+
+import pytest
+
+from circuit_breaker import BreakerRegistry, CircuitBreaker, CircuitOpenError, retry
+
+
+def fail():
+    raise OSError("connection reset")
+
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = CircuitBreaker('yahoo', failure_threshold=3, cooldown=60)
+    for _ in range(3):
+        with pytest.raises(OSError):
+            breaker.call(fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(calls.append, 1)
+    assert calls == []
+    assert breaker.short_circuited == 1
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker('yahoo', failure_threshold=2, cooldown=60)
+    with pytest.raises(OSError):
+        breaker.call(fail)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    with pytest.raises(OSError):
+        breaker.call(fail)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_closes_or_reopens():
+    breaker = CircuitBreaker('yahoo', failure_threshold=1, cooldown=0.05)
+    with pytest.raises(OSError):
+        breaker.call(fail)
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    # Only one probe goes through; a failed probe opens the circuit again
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_registry_shares_breakers_by_name():
+    registry = BreakerRegistry(failure_threshold=1, cooldown=60)
+    assert registry.get('yahoo') is registry.get('yahoo')
+    with pytest.raises(OSError):
+        registry.get('yahoo').call(fail)
+    assert registry.stats() == {'yahoo': {'state': 'open', 'short_circuited': 0}}
+
+
+def test_retry_gives_up_after_attempts():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise OSError("timeout")
+        return 'ok'
+
+    assert retry(flaky, attempts=3, base_delay=0.001) == 'ok'
+    calls.clear()
+    with pytest.raises(OSError):
+        retry(flaky, attempts=2, base_delay=0.001)
+    assert len(calls) == 2
+
+
+def test_retry_respects_veto():
+    calls = []
+
+    def not_found():
+        calls.append(1)
+        raise ValueError("404")
+
+    with pytest.raises(ValueError):
+        retry(not_found, attempts=3, base_delay=0.001,
+              retryable=lambda e: not isinstance(e, ValueError))
+    assert len(calls) == 1
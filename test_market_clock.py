@@ -0,0 +1,100 @@
+"""
+Tests for the exchange session clock (run with pytest).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from market_clock import MarketClock
+
+ET = pytz.timezone('US/Eastern')
+
+
+def et(*args):
+    return ET.localize(datetime(*args))
+
+
+def make_clock():
+    return MarketClock(holidays=['2026-11-26', '2027-01-01'], early_closes={'2026-11-27': '13:00'})
+
+
+def test_regular_day_sessions():
+    clock = make_clock()
+    assert clock.session(et(2026, 10, 14, 6, 59)) == MarketClock.CLOSED
+    assert clock.session(et(2026, 10, 14, 7, 0)) == MarketClock.PREMARKET
+    assert clock.session(et(2026, 10, 14, 9, 30)) == MarketClock.REGULAR
+    assert clock.session(et(2026, 10, 14, 15, 59)) == MarketClock.REGULAR
+    assert clock.session(et(2026, 10, 14, 16, 0)) == MarketClock.AFTER_HOURS
+    assert clock.session(et(2026, 10, 14, 20, 0)) == MarketClock.CLOSED
+
+
+def test_weekend_and_holiday_stay_closed():
+    clock = make_clock()
+    assert clock.session(et(2026, 10, 17, 12, 0)) == MarketClock.CLOSED
+    # Thanksgiving
+    assert not clock.is_trading_day(date(2026, 11, 26))
+    assert clock.session(et(2026, 11, 26, 10, 0)) == MarketClock.CLOSED
+    assert clock.next_transition(et(2026, 11, 25, 20, 0)) == (et(2026, 11, 27, 7, 0),
+                                                              MarketClock.PREMARKET)
+
+
+def test_early_close_keeps_after_hours_length():
+    clock = make_clock()
+    assert clock.session(et(2026, 11, 27, 12, 59)) == MarketClock.REGULAR
+    assert clock.session(et(2026, 11, 27, 13, 0)) == MarketClock.AFTER_HOURS
+    assert clock.session(et(2026, 11, 27, 16, 59)) == MarketClock.AFTER_HOURS
+    assert clock.session(et(2026, 11, 27, 17, 0)) == MarketClock.CLOSED
+
+
+def test_dst_switch_moves_utc_open():
+    clock = make_clock()
+    # EDT ends on Sunday 2026-11-01: the 9:30 open moves from 13:30 to 14:30 UTC
+    friday = clock.next_open(et(2026, 10, 30, 8, 0))
+    monday = clock.next_open(et(2026, 10, 30, 12, 0))
+    assert friday.astimezone(pytz.utc).hour == 13 and friday.astimezone(pytz.utc).minute == 30
+    assert monday.astimezone(pytz.utc).hour == 14 and monday.astimezone(pytz.utc).minute == 30
+    assert monday.astimezone(ET).replace(tzinfo=None) == datetime(2026, 11, 2, 9, 30)
+    # The weekend gap spans the extra hour
+    gap = clock.seconds_until_transition(et(2026, 10, 30, 20, 0))
+    assert gap == timedelta(days=2, hours=12).total_seconds()
+
+
+def test_year_rollover_skips_new_year_holiday():
+    clock = make_clock()
+    assert clock.next_open(et(2026, 12, 31, 17, 0)) == et(2027, 1, 4, 9, 30)
+
+
+def test_next_open_past_the_table():
+    clock = make_clock()
+    last_year = clock._years[1]
+    day = date(last_year, 12, 31)
+    while not clock.is_trading_day(day):
+        day -= timedelta(days=1)
+
+    next_open = clock.next_open(et(day.year, day.month, day.day, 17, 0))
+
+    first = date(last_year + 1, 1, 2)
+    while not clock.is_trading_day(first):
+        first += timedelta(days=1)
+    assert next_open == et(first.year, first.month, first.day, 9, 30)
+
+
+def test_far_future_lookup_extends_table():
+    clock = make_clock()
+    year = clock._years[1] + 5
+    assert clock.session(et(year, 3, 10, 10, 0)) in (MarketClock.REGULAR, MarketClock.CLOSED)
+    assert clock._years[1] >= year + 1
+
+
+def test_has_opened_and_time_since_transition():
+    clock = make_clock()
+    assert not clock.has_opened(et(2026, 10, 14, 9, 0))
+    assert clock.has_opened(et(2026, 10, 14, 9, 30))
+    assert not clock.has_opened(et(2026, 11, 26, 12, 0))
+    # Saturday noon: the last change was Friday's after-hours end
+    assert clock.seconds_since_transition(et(2026, 10, 17, 12, 0)) == 16 * 3600
@@ -0,0 +1,85 @@
+"""
+Tests for the priority-ordered thread pool (run with pytest).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import threading
+
+import pytest
+
+from priority_executor import PriorityExecutor
+
+
+def occupy(executor):
+    """Submit work that holds a worker until the returned gate is set."""
+    started, gate = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        return gate.wait()
+
+    future = executor.submit(hold)
+    assert started.wait(2)
+    return future, gate
+
+
+def test_queued_work_runs_lowest_priority_number_first():
+    executor = PriorityExecutor(max_workers=1)
+    order = []
+    blocker, gate = occupy(executor)
+    try:
+        futures = [
+            executor.submit(order.append, 'iv-1', priority=2),
+            executor.submit(order.append, 'overview', priority=0),
+            executor.submit(order.append, 'iv-2', priority=2),
+            executor.at(1).submit(order.append, 'movers'),
+        ]
+        assert executor.queued() == 4
+        gate.set()
+        for future in [blocker] + futures:
+            future.result(timeout=2)
+        # Equal priorities keep submission order
+        assert order == ['overview', 'movers', 'iv-1', 'iv-2']
+    finally:
+        gate.set()
+        executor.shutdown()
+
+
+def test_results_and_exceptions_reach_futures():
+    executor = PriorityExecutor(max_workers=2)
+    try:
+        assert executor.submit(lambda a, b: a + b, 2, 3).result(timeout=2) == 5
+        with pytest.raises(ZeroDivisionError):
+            executor.submit(lambda: 1 / 0).result(timeout=2)
+    finally:
+        executor.shutdown()
+
+
+def test_workers_are_started_lazily_up_to_max():
+    executor = PriorityExecutor(max_workers=2)
+    assert executor._threads == []
+    (first, first_gate), (second, second_gate) = occupy(executor), occupy(executor)
+    try:
+        queued = executor.submit(lambda: 'done')
+        assert len(executor._threads) == 2
+        first_gate.set()
+        assert queued.result(timeout=2) == 'done'
+    finally:
+        first_gate.set()
+        second_gate.set()
+        executor.shutdown()
+
+
+def test_shutdown_cancels_queued_work_and_rejects_new_work():
+    executor = PriorityExecutor(max_workers=1)
+    running, gate = occupy(executor)
+    queued = executor.submit(lambda: None)
+    executor.shutdown(wait=False, cancel_futures=True)
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+    gate.set()
+    assert running.result(timeout=2) is True
@@ -0,0 +1,108 @@
+"""
+Tests for the per-provider token-bucket rate limiter (run with pytest).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from rate_limiter import RateLimiter, TokenBucket
+
+
+def test_burst_then_reservations_queue_in_order():
+    bucket = TokenBucket(calls_per_minute=600, burst=2)  # 10 tokens/s
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    first = bucket.reserve()
+    second = bucket.reserve()
+    assert first == pytest.approx(0.1, abs=0.02)
+    assert second == pytest.approx(0.2, abs=0.02)
+    assert bucket.queue_depth == 2
+
+
+def test_try_acquire_never_goes_negative():
+    bucket = TokenBucket(calls_per_minute=60, burst=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.available < 1
+
+
+def test_acquire_gives_up_past_timeout():
+    bucket = TokenBucket(calls_per_minute=60, burst=1)
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert not bucket.acquire(timeout=0.1)
+    assert time.monotonic() - started < 0.1
+
+
+def test_multi_token_reservation():
+    bucket = TokenBucket(calls_per_minute=600, burst=5)
+    assert bucket.reserve(5) == 0
+    assert bucket.reserve(3) == pytest.approx(0.3, abs=0.02)
+
+
+def test_unlimited_provider_is_never_throttled():
+    limiter = RateLimiter({'yahoo': 60})
+    assert limiter.reserve('rss', 100) == 0
+    assert limiter.try_acquire('rss')
+    assert limiter.queue_depth('rss') == 0
+
+
+def test_submit_parks_waiting_calls_off_the_executor():
+    limiter = RateLimiter({'yahoo': 600}, {'yahoo': 1})  # 10 tokens/s, burst 1
+    executor = ThreadPoolExecutor(max_workers=1)
+    ran = []
+
+    def call(i):
+        ran.append((i, time.monotonic()))
+        return i
+
+    try:
+        started = time.monotonic()
+        futures = [limiter.submit('yahoo', executor, call, i) for i in range(4)]
+        # Only the first call is on the executor yet; the rest wait on the timer thread
+        assert limiter.queue_depth('yahoo') == 3
+        assert [future.result(timeout=2) for future in futures] == [0, 1, 2, 3]
+        assert [i for i, _ in ran] == [0, 1, 2, 3]
+        assert ran[-1][1] - started == pytest.approx(0.3, abs=0.1)
+    finally:
+        limiter.close()
+        executor.shutdown()
+
+
+def test_submit_charges_tokens():
+    limiter = RateLimiter({'yahoo': 600}, {'yahoo': 10})
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        limiter.submit('yahoo', executor, lambda: None, tokens=10).result(timeout=1)
+        assert limiter.buckets['yahoo'].available < 1
+    finally:
+        limiter.close()
+        executor.shutdown()
+
+
+def test_close_fails_queued_calls_once_executor_is_gone():
+    limiter = RateLimiter({'yahoo': 6}, {'yahoo': 1})  # 10s between calls
+    executor = ThreadPoolExecutor(max_workers=1)
+    limiter.submit('yahoo', executor, lambda: None).result(timeout=1)
+    queued = limiter.submit('yahoo', executor, lambda: None)
+    executor.shutdown()
+    limiter.close()
+    with pytest.raises(RuntimeError):
+        queued.result(timeout=1)
+
+
+def test_concurrent_reservations_are_all_counted():
+    bucket = TokenBucket(calls_per_minute=60, burst=50)
+    threads = [threading.Thread(target=bucket.reserve) for _ in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert bucket.available == pytest.approx(10, abs=0.5)
@@ -0,0 +1,80 @@
+"""
+Tests for the quota-aware request planner (run with pytest).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from rate_limiter import RateLimiter
+from request_planner import RequestPlanner
+
+LIMITS = {
+    'yahoo': {'quotes': 3, 'iv': 2},
+    'alpha_vantage': {'quotes': 1},
+}
+
+
+def nothing_cached(kind, symbol):
+    return False
+
+
+def symbols(n):
+    return [f"S{i}" for i in range(n)]
+
+
+def test_requests_are_merged_and_batched_in_kind_order():
+    planner = RequestPlanner(LIMITS)
+    plan = planner.plan([{'iv': ['A', 'B']}, {'quotes': ['A', 'B', 'C', 'D'], 'iv': ['B']}],
+                        nothing_cached)
+    assert [(call['kind'], call['symbols']) for call in plan.calls] == [
+        ('quotes', ('A', 'B', 'C')),
+        ('quotes', ('D',)),
+        ('iv', ('A', 'B')),
+    ]
+    assert plan.expected_cost() == {'yahoo': 3}
+    assert plan.deferred == {}
+
+
+def test_cached_symbols_are_skipped():
+    planner = RequestPlanner(LIMITS)
+    plan = planner.plan([{'quotes': ['A', 'B']}], lambda kind, symbol: symbol == 'A')
+    assert plan.cached == {'quotes': ['A']}
+    assert [call['symbols'] for call in plan.calls] == [('B',)]
+
+
+def test_quota_spills_to_next_provider_then_defers():
+    limiter = RateLimiter({'yahoo': 60, 'alpha_vantage': 60}, {'yahoo': 1, 'alpha_vantage': 2})
+    planner = RequestPlanner(LIMITS, limiter)
+    plan = planner.plan([{'quotes': symbols(8)}], nothing_cached)
+
+    assert [(call['provider'], len(call['symbols'])) for call in plan.calls] == [
+        ('yahoo', 3), ('alpha_vantage', 1), ('alpha_vantage', 1),
+    ]
+    assert plan.expected_cost() == {'yahoo': 1, 'alpha_vantage': 2}
+    assert plan.deferred == {'quotes': ['S5', 'S6', 'S7']}
+    summary = plan.summary()
+    assert summary['calls'] == 3 and summary['deferred'] == {'quotes': 3}
+
+
+def test_per_symbol_cost_buys_symbols_not_calls():
+    limiter = RateLimiter({'yahoo': 60}, {'yahoo': 3})
+    planner = RequestPlanner({'yahoo': {'iv': 2}}, limiter, {'yahoo': ['iv']})
+    plan = planner.plan([{'iv': symbols(5)}], nothing_cached)
+
+    assert [(call['symbols'], call['cost']) for call in plan.calls] == [
+        (('S0', 'S1'), 2), (('S2',), 1),
+    ]
+    assert plan.expected_cost() == {'yahoo': 3}
+    assert plan.deferred == {'iv': ['S3', 'S4']}
+
+
+def test_quota_is_shared_across_kinds():
+    limiter = RateLimiter({'yahoo': 60}, {'yahoo': 2})
+    planner = RequestPlanner({'yahoo': {'quotes': 3, 'iv': 2}}, limiter, {'yahoo': ['iv']})
+    plan = planner.plan([{'quotes': ['A'], 'iv': ['A', 'B']}], nothing_cached)
+    # One token for the quote batch leaves one IV symbol
+    assert [(call['kind'], call['symbols']) for call in plan.calls] == [
+        ('quotes', ('A',)), ('iv', ('A',)),
+    ]
+    assert plan.deferred == {'iv': ['B']}
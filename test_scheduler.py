@@ -0,0 +1,182 @@
+"""
+Tests for per-panel refresh scheduling (run with pytest).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import threading
+import time
+
+import pytest
+
+from scheduler import RefreshScheduler
+
+
+class Recorder:
+    """Collects scheduler callbacks and lets a test wait for them."""
+
+    def __init__(self):
+        self.events = []
+        self._cond = threading.Condition()
+
+    def __call__(self, name):
+        def record(*args):
+            with self._cond:
+                self.events.append((name, time.monotonic()) + args)
+                self._cond.notify_all()
+        return record
+
+    def wait_for(self, name, count=1, timeout=3):
+        with self._cond:
+            assert self._cond.wait_for(
+                lambda: len(self.of(name)) >= count, timeout), f"no {name} callback"
+            return self.of(name)
+
+    def of(self, name):
+        return [event for event in self.events if event[0] == name]
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+def make_scheduler(recorder, **kwargs):
+    kwargs.setdefault('coalesce', 0.05)
+    return RefreshScheduler(max_workers=4, on_batch_start=recorder('start'),
+                            on_batch_end=recorder('end'), on_late_done=recorder('late_done'),
+                            on_batch_timing=recorder('timing'), **kwargs)
+
+
+def test_batch_ends_when_all_jobs_finish(recorder):
+    scheduler = make_scheduler(recorder, budget=2)
+    ran = []
+    scheduler.add('a', lambda: ran.append('a'), lambda: 60)
+    scheduler.add('b', lambda: ran.append('b'), lambda: 60)
+    scheduler.start()
+    try:
+        _, at, names, late = recorder.wait_for('end')[0]
+        assert sorted(names) == ['a', 'b'] and late == []
+        assert sorted(ran) == ['a', 'b']
+        _, _, names, first_paint, complete = recorder.wait_for('timing')[0]
+        assert 0 <= first_paint <= complete < 2
+        assert 55 < scheduler.next_due()['a'] <= 60
+    finally:
+        scheduler.stop()
+
+
+def test_deadline_reports_late_jobs_then_their_completion(recorder):
+    scheduler = make_scheduler(recorder, budget=0.3)
+    release = threading.Event()
+    scheduler.add('fast', lambda: None, lambda: 60)
+    scheduler.add('slow', release.wait, lambda: 60)
+    scheduler.start()
+    started = time.monotonic()
+    try:
+        _, at, names, late = recorder.wait_for('end')[0]
+        assert late == ['slow']
+        assert at - started == pytest.approx(0.3, abs=0.15)
+        assert scheduler.in_flight() == ['slow']
+        assert recorder.of('late_done') == []
+
+        release.set()
+        _, _, still_late = recorder.wait_for('late_done')[0]
+        assert still_late == []
+        assert len(recorder.of('end')) == 1  # the batch is not ended twice
+    finally:
+        release.set()
+        scheduler.stop()
+
+
+def test_jobs_rerun_on_their_own_cadence(recorder):
+    scheduler = make_scheduler(recorder, budget=1, coalesce=0.01)
+    runs = {'fast': 0, 'slow': 0}
+
+    def job(name):
+        def run():
+            runs[name] += 1
+        return run
+
+    scheduler.add('fast', job('fast'), lambda: 0.1)
+    scheduler.add('slow', job('slow'), lambda: 60)
+    scheduler.start()
+    try:
+        time.sleep(0.55)
+        assert runs['slow'] == 1
+        assert 4 <= runs['fast'] <= 7
+    finally:
+        scheduler.stop()
+
+
+def test_prepared_jobs_wait_for_prepare(recorder):
+    order = []
+
+    def prepare(names, deadline):
+        time.sleep(0.1)
+        order.append(('prepare', tuple(names), deadline > time.monotonic()))
+
+    scheduler = make_scheduler(recorder, budget=2, prepare=prepare)
+    scheduler.add('quotes', lambda: order.append('quotes'), lambda: 60, prepared=True)
+    scheduler.add('news', lambda: order.append('news'), lambda: 60)
+    scheduler.start()
+    try:
+        recorder.wait_for('end')
+        assert order.index(('prepare', ('quotes',), True)) < order.index('quotes')
+        assert order.index('news') < order.index('quotes')  # unprepared jobs do not wait
+    finally:
+        scheduler.stop()
+
+
+def test_lower_classes_wait_for_higher_ones(recorder):
+    order = []
+    scheduler = make_scheduler(recorder, budget=2)
+    scheduler.add('iv', lambda: order.append('iv'), lambda: 60, priority=2)
+    scheduler.add('overview', lambda: (time.sleep(0.1), order.append('overview')), lambda: 60,
+                  priority=0)
+    scheduler.start()
+    try:
+        recorder.wait_for('end')
+        assert order == ['overview', 'iv']
+        _, _, _, first_paint, complete = recorder.wait_for('timing')[0]
+        assert first_paint >= 0.1
+    finally:
+        scheduler.stop()
+
+
+def test_deferred_job_is_pushed_back_once(recorder):
+    asked = []
+    ran = []
+
+    def should_defer(name):
+        asked.append(name)
+        return True
+
+    scheduler = make_scheduler(recorder, budget=1, should_defer=should_defer, defer_delay=0.2)
+    scheduler.add('news', lambda: ran.append(time.monotonic()), lambda: 60)
+    started = time.monotonic()
+    scheduler.start()
+    try:
+        recorder.wait_for('timing', count=2)
+        # Vetoed once, then run after defer_delay (less the coalesce window) without asking again
+        assert asked == ['news']
+        assert len(ran) == 1 and ran[0] - started >= 0.2 - 0.05
+        assert recorder.of('timing')[0][2] == ['news']
+        assert scheduler.timings()[0]['deferred'] == ['news']
+    finally:
+        scheduler.stop()
+
+
+def test_trigger_runs_idle_jobs_now(recorder):
+    scheduler = make_scheduler(recorder, budget=1)
+    runs = []
+    scheduler.add('a', lambda: runs.append('a'), lambda: 60)
+    scheduler.start()
+    try:
+        recorder.wait_for('end')
+        scheduler.trigger(['a'])
+        recorder.wait_for('end', count=2)
+        assert runs == ['a', 'a']
+    finally:
+        scheduler.stop()
@@ -0,0 +1,82 @@
+"""
+Tests for single-flight request coalescing (run with pytest).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data_fetcher import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    gate = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        gate.wait(2)
+        return 'quote'
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, 'quote_SPY', fetch) for _ in range(5)]
+        time.sleep(0.1)
+        gate.set()
+        assert [future.result(timeout=2) for future in futures] == ['quote'] * 5
+    assert len(calls) == 1
+
+
+def test_leader_error_reaches_waiters_and_key_is_released():
+    flight = SingleFlight()
+    gate = threading.Event()
+
+    def fail():
+        gate.wait(2)
+        raise OSError("upstream down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, 'k', fail)
+        time.sleep(0.05)
+        waiter = pool.submit(flight.do, 'k', lambda: 'unused')
+        time.sleep(0.05)
+        gate.set()
+        for future in (leader, waiter):
+            with pytest.raises(OSError):
+                future.result(timeout=2)
+
+    assert flight.do('k', lambda: 'fresh') == 'fresh'
+
+
+def test_acquire_splits_owned_and_pending_keys():
+    flight = SingleFlight()
+    owned, pending = flight.acquire(['a', 'b'])
+    assert owned == ['a', 'b'] and pending == {}
+
+    owned, pending = flight.acquire(['b', 'c'])
+    assert owned == ['c'] and list(pending) == ['b']
+
+    flight.release('b', 2)
+    flight.release('a')
+    assert flight.results(pending) == {'b': 2}
+
+
+def test_waiters_give_up_on_a_hung_leader():
+    flight = SingleFlight(wait_timeout=0.1)
+    owned, pending = flight.acquire(['hung'])
+    try:
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            flight.do('hung', lambda: 'unused')
+        assert time.monotonic() - started < 1
+
+        _, pending = flight.acquire(['hung'])
+        assert flight.results(pending) == {}
+    finally:
+        flight.release('hung')
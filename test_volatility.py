@@ -0,0 +1,100 @@
+"""
+Tests for the rolling and vectorized volatility computations (run with pytest).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import IV_SHORT_WINDOW, IV_LONG_WINDOW, TRADING_DAYS_PER_YEAR
+from utils import get_iv_color_code
+from volatility import VolatilityEngine, iv_color_codes, volatility_matrix
+
+SCALE = math.sqrt(TRADING_DAYS_PER_YEAR) * 100
+
+
+def random_closes(rows, columns, seed=7):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.015, (rows, columns)), axis=0))
+
+
+def pandas_vol(column, window):
+    return pd.Series(column).dropna().pct_change().tail(window).std() * SCALE
+
+
+def test_volatility_matrix_matches_pandas():
+    closes = random_closes(80, 4)
+    stats = volatility_matrix(closes)
+    for j in range(closes.shape[1]):
+        assert stats['short'][j] == pytest.approx(pandas_vol(closes[:, j], IV_SHORT_WINDOW))
+        assert stats['long'][j] == pytest.approx(pandas_vol(closes[:, j], IV_LONG_WINDOW))
+
+
+def test_volatility_matrix_skips_nan_gaps_per_column():
+    closes = random_closes(60, 2)
+    closes[50, 0] = np.nan  # one missing close shortens only that column's gap
+    closes[:20, 1] = np.nan  # late listing
+    stats = volatility_matrix(closes)
+    for j in range(2):
+        returns = pd.Series(closes[:, j]).pct_change(fill_method=None).dropna()
+        expected = returns.tail(IV_SHORT_WINDOW).std() * SCALE
+        assert stats['short'][j] == pytest.approx(expected)
+
+
+def test_volatility_matrix_too_short_is_nan():
+    stats = volatility_matrix(random_closes(2, 1))
+    assert np.isnan(stats['short'][0])
+    assert stats['color'][0] == "⚪"
+
+
+def test_iv_color_codes_match_scalar_version():
+    long = np.full(9, 20.0)
+    short = long * (1 + np.array([0.2, 0.10001, 0.10, 0.05, 0.0, -0.05, -0.0501, -0.5, 0.07]))
+    codes = iv_color_codes((short - long) / long)
+    for i in range(len(long)):
+        assert codes[i] == get_iv_color_code(short[i], long[i])
+
+    assert list(iv_color_codes(np.array([np.nan, np.inf]))) == ["⚪", "⚪"]
+
+
+def test_engine_matches_pandas_and_syncs_incrementally():
+    closes = random_closes(60, 1)[:, 0]
+    start = date(2026, 6, 1)
+    days = pd.DatetimeIndex([start + timedelta(days=i) for i in range(60)])
+    series = pd.Series(closes, index=days)
+    today = days[-1].date()
+
+    engine = VolatilityEngine()
+    # First load everything but the last two closes, then sync the rest
+    engine.sync('X', series.iloc[:-2], days[-3].date())
+    live = engine.sync('X', series.iloc[-3:], today)
+
+    assert live == pytest.approx(closes[-1])  # today's bar is live, not folded in
+    assert engine.last_close_date('X') == days[-2].date()
+    short, long = engine.get('X').annualized()
+    assert short == pytest.approx(pandas_vol(closes[:-1], IV_SHORT_WINDOW))
+    assert long == pytest.approx(pandas_vol(closes[:-1], IV_LONG_WINDOW))
+    short, _ = engine.get('X').annualized(live)
+    assert short == pytest.approx(pandas_vol(closes, IV_SHORT_WINDOW))
+
+
+def test_needs_sync_only_waits_for_an_expected_bar():
+    engine = VolatilityEngine()
+    today = date(2026, 10, 16)
+    assert engine.needs_sync('X', today)
+
+    engine.sync('X', pd.Series([100.0, 101.0], index=pd.to_datetime(['2026-10-14', '2026-10-15'])),
+                today)
+    assert not engine.needs_sync('X', today, bar_expected=False)
+    assert engine.needs_sync('X', today, bar_expected=True)
+    assert engine.needs_sync('X', today + timedelta(days=1), bar_expected=False)
+
+    engine.sync('X', pd.Series([102.0], index=pd.to_datetime(['2026-10-16'])), today)
+    assert not engine.needs_sync('X', today, bar_expected=True)